@@ -9,12 +9,16 @@ import sys
 import subprocess
 from datetime import datetime
 
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 def run_git_command(command):
-    """Run git command and return result"""
+    """Run git command (argv list) and return result"""
     try:
         result = subprocess.run(
             command,
-            shell=True,
             capture_output=True,
             text=True,
             cwd=os.getcwd()
@@ -23,34 +27,113 @@ def run_git_command(command):
     except Exception as e:
         return False, "", str(e)
 
-def get_git_status():
-    """Get git status"""
-    success, stdout, stderr = run_git_command("git status --porcelain")
+def open_repository():
+    """Open the repository in-process with pygit2, or None to use the git CLI"""
+    if pygit2 is None:
+        return None
+    try:
+        path = pygit2.discover_repository(os.getcwd())
+        return pygit2.Repository(path) if path else None
+    except pygit2.GitError:
+        return None
+
+def is_git_repository():
+    """Check whether the working directory is inside a git work tree"""
+    success, stdout, stderr = run_git_command(["git", "rev-parse", "--is-inside-work-tree"])
+    return success and stdout.strip() == "true"
+
+def get_git_status(repo=None):
+    """Get git status and current branch name in a single git call"""
+    if repo is not None:
+        return True, format_status(repo.status()), get_branch_name(repo)
+    success, stdout, stderr = run_git_command(["git", "-c", "color.ui=false", "status", "--porcelain", "--branch"])
     if not success:
-        return False, stderr
-    return True, stdout
-
-def get_branch_name():
-    """Get current branch name"""
-    success, stdout, stderr = run_git_command("git rev-parse --abbrev-ref HEAD")
-    if success:
-        return stdout.strip()
-    return "main"
-
-def add_files():
+        return False, stderr, None
+    header, _, status = stdout.partition('\n')
+    return True, status, parse_branch_name(header)
+
+def parse_branch_name(header):
+    """Parse branch name from the '## branch...upstream' status header"""
+    branch = header[3:] if header.startswith("## ") else ""
+    for prefix in ("No commits yet on ", "Initial commit on "):
+        if branch.startswith(prefix):
+            branch = branch[len(prefix):]
+    branch = branch.split("...", 1)[0].split(" ", 1)[0]
+    if not branch or branch == "HEAD":
+        return "main"
+    return branch
+
+def format_status(status):
+    """Format pygit2 status flags as 'git status --porcelain' lines"""
+    lines = []
+    for path, flags in sorted(status.items()):
+        if flags & pygit2.GIT_STATUS_IGNORED:
+            continue
+        if flags & pygit2.GIT_STATUS_WT_NEW:
+            lines.append(f"?? {path}")
+            continue
+        x = _status_code(flags, _INDEX_CODES)
+        y = _status_code(flags, _WORKTREE_CODES)
+        lines.append(f"{x}{y} {path}")
+    return "\n".join(lines)
+
+def _status_code(flags, codes):
+    for flag, code in codes:
+        if flags & flag:
+            return code
+    return " "
+
+if pygit2 is not None:
+    _INDEX_CODES = (
+        (pygit2.GIT_STATUS_INDEX_NEW, "A"),
+        (pygit2.GIT_STATUS_INDEX_MODIFIED, "M"),
+        (pygit2.GIT_STATUS_INDEX_DELETED, "D"),
+        (pygit2.GIT_STATUS_INDEX_RENAMED, "R"),
+        (pygit2.GIT_STATUS_INDEX_TYPECHANGE, "T"),
+    )
+    _WORKTREE_CODES = (
+        (pygit2.GIT_STATUS_WT_MODIFIED, "M"),
+        (pygit2.GIT_STATUS_WT_DELETED, "D"),
+        (pygit2.GIT_STATUS_WT_RENAMED, "R"),
+        (pygit2.GIT_STATUS_WT_TYPECHANGE, "T"),
+    )
+
+def get_branch_name(repo):
+    """Current branch name from HEAD, matching parse_branch_name defaults"""
+    if repo.head_is_detached:
+        return "main"
+    target = repo.references["HEAD"].target
+    return target[len("refs/heads/"):] if target.startswith("refs/heads/") else "main"
+
+def add_files(repo=None):
     """Add all files to git"""
-    success, stdout, stderr = run_git_command("git add .")
+    if repo is not None:
+        try:
+            repo.index.add_all()
+            repo.index.write()
+            return True, ""
+        except pygit2.GitError as e:
+            return False, str(e)
+    success, stdout, stderr = run_git_command(["git", "add", "."])
     return success, stderr
 
-def commit_changes(message):
+def commit_changes(message, repo=None):
     """Commit changes"""
-    success, stdout, stderr = run_git_command(f'git commit -m "{message}"')
+    if repo is not None:
+        try:
+            tree = repo.index.write_tree()
+            parents = [] if repo.head_is_unborn else [repo.head.target]
+            signature = repo.default_signature
+            repo.create_commit("HEAD", signature, signature, message, tree, parents)
+            return True, ""
+        except (pygit2.GitError, KeyError) as e:
+            return False, str(e)
+    success, stdout, stderr = run_git_command(["git", "commit", "-m", message])
     return success, stderr
 
-def push_to_github():
+def push_to_github(branch):
     """Push to GitHub"""
-    branch = get_branch_name()
-    success, stdout, stderr = run_git_command(f"git push origin {branch}")
+    success, stdout, stderr = run_git_command(["git", "push", "origin", branch])
     return success, stderr
 
 def create_commit_message():
@@ -64,13 +147,16 @@ def main():
     print("HVAC Business Analyst - Auto GitHub Push")
     print("=" * 60)
 
+    # Status, add and commit run in-process when pygit2 is installed
+    repo = open_repository()
+
     # Check git repository
-    if not os.path.exists(".git"):
+    if repo is None and not is_git_repository():
         print("❌ Not a git repository")
         return False
 
     # Get git status
-    success, status = get_git_status()
+    success, status, branch = get_git_status(repo)
     if not success:
         print(f"❌ Failed to get git status: {status}")
         return False
@@ -90,21 +176,21 @@ def main():
 
     # Add files
     print("\n📤 Adding files...")
-    success, error = add_files()
+    success, error = add_files(repo)
     if not success:
         print(f"❌ Failed to add files: {error}")
         return False
 
     # Commit changes
     print("\n💾 Committing changes...")
-    success, error = commit_changes(commit_msg)
+    success, error = commit_changes(commit_msg, repo)
     if not success:
         print(f"❌ Failed to commit: {error}")
         return False
 
     # Push to GitHub
     print("\n🚀 Pushing to GitHub...")
-    success, error = push_to_github()
+    success, error = push_to_github(branch)
     if not success:
         print(f"❌ Failed to push: {error}")
         return False
@@ -5,23 +5,40 @@ HVAC首席商业分析师技能 - 打包脚本
 """
 
 import os
+import sys
 import zipfile
 import yaml
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import shutil
 
+# 优先使用libyaml的C解析器，未安装时回退到纯Python实现
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# 已压缩格式直接存储，不再重复deflate
+STORED_EXTS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.zip', '.gz', '.woff2'}
+
+# 打包时预读的文件数上限，限制内存占用
+READ_AHEAD = 16
+
 def validate_skill_structure(skill_dir):
-    """验证技能目录结构"""
-    print("=" * 60)
-    print("验证HVAC首席商业分析师技能结构")
-    print("=" * 60)
+    """验证技能目录结构，返回(是否通过, [(文件路径, 包内路径), ...])"""
+    # 输出先收集起来，结束时一次性写出
+    log = []
+    out = log.append
+
+    out("=" * 60)
+    out("验证HVAC首席商业分析师技能结构")
+    out("=" * 60)
 
     required_files = [
         'SKILL.md',
         'scripts/framework_collector.py',
         'scripts/data_source_manager.py',
         'scripts/data_collector.py',
+        'scripts/backpressure.py',
         'scripts/bosch_deep_analyzer.py',
         'scripts/report_generator.py',
         'references/hvac_analysis_framework.md',
@@ -40,100 +57,135 @@ def validate_skill_structure(skill_dir):
         'scripts/README.md'
     ]
 
+    # skill_dir只拼接一次前缀，后续路径直接字符串相加
+    base = os.path.join(skill_dir, '')
+
+    # 单次遍历：收集已有文件的相对路径（统一为/分隔），同时统计各类型文件
+    present = set()
+    package_files = []
+    file_count = python_files = md_files = svg_files = 0
+    for root, dirs, files in os.walk(skill_dir):
+        file_count += len(files)
+        rel_root = root[len(base):]
+        prefix = rel_root.replace(os.sep, '/') + '/' if rel_root else ''
+        root_prefix = os.path.join(root, '')
+        for f in files:
+            present.add(prefix + f)
+            package_files.append((root_prefix + f, prefix + f))
+            _, dot, ext = f.rpartition('.')
+            if not dot:
+                continue
+            if ext == 'py':
+                python_files += 1
+            elif ext == 'md':
+                md_files += 1
+            elif ext == 'svg':
+                svg_files += 1
+
     validation_passed = True
 
     # 检查必需文件
-    print("\n📋 检查必需文件:")
+    out("\n📋 检查必需文件:")
     for file_path in required_files:
-        full_path = os.path.join(skill_dir, file_path)
-        if os.path.exists(full_path):
-            print(f"  ✅ {file_path}")
+        if file_path in present:
+            out(f"  ✅ {file_path}")
         else:
-            print(f"  ❌ 缺失: {file_path}")
+            out(f"  ❌ 缺失: {file_path}")
             validation_passed = False
 
     # 检查可选文件
-    print("\n📋 检查可选文件:")
+    out("\n📋 检查可选文件:")
     for file_path in optional_files:
-        full_path = os.path.join(skill_dir, file_path)
-        if os.path.exists(full_path):
-            print(f"  ✅ {file_path}")
+        if file_path in present:
+            out(f"  ✅ {file_path}")
         else:
-            print(f"  ⚠️  未找到: {file_path} (可选)")
+            out(f"  ⚠️  未找到: {file_path} (可选)")
 
     # 验证SKILL.md
-    print("\n📋 验证SKILL.md:")
-    skill_md_path = os.path.join(skill_dir, 'SKILL.md')
+    out("\n📋 验证SKILL.md:")
+    skill_md_path = base + 'SKILL.md'
     try:
-        with open(skill_md_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            if '---' in content:
+        with open(skill_md_path, 'rb') as f:
+            # 只读取文件头部，前8KB内找不到frontmatter结束标记时才读取全文
+            content = f.read(8192)
+            end = content.find(b'\n---', 3) if content.startswith(b'---') else -1
+            if end < 0:
+                content += f.read()
+            if b'---' in content:
                 # 检查YAML frontmatter
-                parts = content.split('---')
+                parts = (b'', content[3:end], b'') if end > 0 else content.split(b'---')
                 if len(parts) >= 3:
                     yaml_content = parts[1]
-                    frontmatter = yaml.safe_load(yaml_content)
+                    frontmatter = yaml.load(yaml_content, Loader=Loader)
                     if 'name' in frontmatter and 'description' in frontmatter:
-                        print(f"  ✅ 名称: {frontmatter['name']}")
-                        print(f"  ✅ 描述: {frontmatter['description'][:60]}...")
+                        out(f"  ✅ 名称: {frontmatter['name']}")
+                        out(f"  ✅ 描述: {frontmatter['description'][:60]}...")
                     else:
-                        print("  ❌ YAML frontmatter缺少必需字段")
+                        out("  ❌ YAML frontmatter缺少必需字段")
                         validation_passed = False
                 else:
-                    print("  ❌ 缺少YAML frontmatter分隔符")
+                    out("  ❌ 缺少YAML frontmatter分隔符")
                     validation_passed = False
             else:
-                print("  ❌ 缺少YAML frontmatter")
+                out("  ❌ 缺少YAML frontmatter")
                 validation_passed = False
     except Exception as e:
-        print(f"  ❌ 读取SKILL.md失败: {e}")
+        out(f"  ❌ 读取SKILL.md失败: {e}")
         validation_passed = False
 
     # 验证数据源配置
-    print("\n📋 验证数据源配置:")
-    config_path = os.path.join(skill_dir, 'references/data_source_config.yaml')
+    out("\n📋 验证数据源配置:")
+    config_path = base + 'references' + os.sep + 'data_source_config.yaml'
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        with open(config_path, 'rb') as f:
+            config = yaml.load(f, Loader=Loader)
             if 'data_sources' in config:
-                print(f"  ✅ 数据源数量: {len(config['data_sources'])}")
+                out(f"  ✅ 数据源数量: {len(config['data_sources'])}")
                 brand_sources = [s for s in config['data_sources'] if s.get('category') == 'brand']
-                print(f"  ✅ 品牌数据源: {len(brand_sources)}")
+                out(f"  ✅ 品牌数据源: {len(brand_sources)}")
                 bosch_sources = [s for s in config['data_sources'] if s.get('special_analysis')]
-                print(f"  ✅ BOSCH专用数据源: {len(bosch_sources)}")
+                out(f"  ✅ BOSCH专用数据源: {len(bosch_sources)}")
             else:
-                print("  ❌ 配置文件中缺少data_sources字段")
+                out("  ❌ 配置文件中缺少data_sources字段")
                 validation_passed = False
     except Exception as e:
-        print(f"  ❌ 读取数据源配置失败: {e}")
+        out(f"  ❌ 读取数据源配置失败: {e}")
         validation_passed = False
 
     # 统计文件数量
-    print("\n📊 文件统计:")
-    file_count = 0
-    for root, dirs, files in os.walk(skill_dir):
-        file_count += len(files)
-
-    python_files = sum(1 for root, dirs, files in os.walk(skill_dir) for f in files if f.endswith('.py'))
-    md_files = sum(1 for root, dirs, files in os.walk(skill_dir) for f in files if f.endswith('.md'))
-    svg_files = sum(1 for root, dirs, files in os.walk(skill_dir) for f in files if f.endswith('.svg'))
+    out("\n📊 文件统计:")
 
-    print(f"  📁 总文件数: {file_count}")
-    print(f"  🐍 Python脚本: {python_files}")
-    print(f"  📄 Markdown文档: {md_files}")
-    print(f"  🎨 SVG图表: {svg_files}")
+    out(f"  📁 总文件数: {file_count}")
+    out(f"  🐍 Python脚本: {python_files}")
+    out(f"  📄 Markdown文档: {md_files}")
+    out(f"  🎨 SVG图表: {svg_files}")
 
-    print("\n" + "=" * 60)
+    out("\n" + "=" * 60)
     if validation_passed:
-        print("✅ 验证通过！技能结构完整")
+        out("✅ 验证通过！技能结构完整")
     else:
-        print("❌ 验证失败！请检查缺失的文件")
-    print("=" * 60)
+        out("❌ 验证失败！请检查缺失的文件")
+    out("=" * 60)
+
+    sys.stdout.write("\n".join(log) + "\n")
+    return validation_passed, package_files
+
+def _read_package_entry(entry, compress=True):
+    """读取待打包文件内容及其zip条目信息（在线程池中执行）"""
+    file_path, arcname = entry
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    if not compress or os.path.splitext(arcname)[1].lower() in STORED_EXTS:
+        zinfo.compress_type = zipfile.ZIP_STORED
+    else:
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+    with open(file_path, 'rb') as f:
+        return zinfo, f.read()
 
-    return validation_passed
+def create_package(skill_dir, output_dir=None, files=None, verbose=False, compress=True):
+    """创建技能包，files为validate_skill_structure返回的文件列表，未提供时重新遍历目录
 
-def create_package(skill_dir, output_dir=None):
-    """创建技能包"""
+    compress=False时所有文件均不压缩存储，适合打包后立即被本地工具使用的场景
+    """
     if output_dir is None:
         output_dir = os.getcwd()
 
@@ -147,14 +199,29 @@ def create_package(skill_dir, output_dir=None):
 
     print(f"\n📦 创建技能包: {package_name}")
 
-    # 创建zip文件
-    with zipfile.ZipFile(package_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(skill_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, skill_dir)
-                zipf.write(file_path, arcname)
-                print(f"  ➕ 添加: {arcname}")
+    if files is None:
+        files = [(os.path.join(root, file), os.path.relpath(os.path.join(root, file), skill_dir))
+                 for root, dirs, names in os.walk(skill_dir) for file in names]
+
+    # 创建zip文件：多个线程预读文件，当前线程按顺序压缩写入（zipfile不支持并发写）
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with zipfile.ZipFile(package_path, 'w', compression, allowZip64=True, compresslevel=1) as zipf, \
+            ThreadPoolExecutor(max_workers=4) as executor:
+        pending = deque()
+
+        def write_next():
+            zinfo, data = pending.popleft().result()
+            zipf.writestr(zinfo, data, compresslevel=zipf.compresslevel)
+            if verbose:
+                print(f"  ➕ 添加: {zinfo.filename}")
+
+        for entry in files:
+            pending.append(executor.submit(_read_package_entry, entry, compress))
+            if len(pending) >= READ_AHEAD:
+                write_next()
+        while pending:
+            write_next()
+    print(f"  ➕ 已添加 {len(files)} 个文件")
 
     # 获取文件大小
     size_mb = os.path.getsize(package_path) / (1024 * 1024)
@@ -165,9 +232,8 @@ def create_package(skill_dir, output_dir=None):
 
     return package_path
 
-def create_readme(skill_dir):
-    """创建README文件"""
-    readme_content = """# HVAC首席商业分析师技能
+# 技能包README内容
+_README_TEMPLATE = """# HVAC首席商业分析师技能
 
 ## 概述
 
@@ -193,6 +259,7 @@ hvac-business-analyst/
 │   ├── framework_collector.py         # 框架收集器
 │   ├── data_source_manager.py         # 数据源管理器
 │   ├── data_collector.py              # 数据收集引擎
+│   ├── backpressure.py                # 请求背压控制
 │   ├── bosch_deep_analyzer.py        # BOSCH深度分析
 │   └── report_generator.py            # 报告生成器
 ├── references/                        # 参考资料
@@ -298,9 +365,11 @@ python scripts/report_generator.py
 **技术支持**: Claude Code
 """
 
+def create_readme(skill_dir):
+    """创建README文件"""
     readme_path = os.path.join(skill_dir, 'README.md')
-    with open(readme_path, 'w', encoding='utf-8') as f:
-        f.write(readme_content)
+    with open(readme_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(_README_TEMPLATE)
     print(f"✅ README.md 已创建")
 
 def main():
@@ -308,15 +377,19 @@ def main():
     skill_dir = os.path.abspath(os.path.dirname(__file__))
 
     # 验证技能结构
-    if not validate_skill_structure(skill_dir):
+    passed, files = validate_skill_structure(skill_dir)
+    if not passed:
         print("\n❌ 验证失败，无法创建技能包")
         return
 
-    # 创建README
+    # 创建README（验证时尚不存在则补入文件列表）
     create_readme(skill_dir)
+    if not any(arcname == 'README.md' for _, arcname in files):
+        files.append((os.path.join(skill_dir, 'README.md'), 'README.md'))
 
     # 创建技能包
-    package_path = create_package(skill_dir)
+    args = sys.argv[1:]
+    package_path = create_package(skill_dir, files=files, verbose='-v' in args, compress='--store' not in args)
 
     print("\n" + "=" * 60)
     print("🎉 HVAC首席商业分析师技能打包完成!")
@@ -1,32 +1,83 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from string import Template
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+def load_json(path):
+    with open(path, 'rb') as f:
+        return _loads(f.read())
+
+CSS = """
+        body { font-family: Arial, sans-serif; max-width: 1000px; margin: 40px auto; padding: 20px; background: #f5f5f5; }
+        .container { background: white; padding: 40px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }
+        h1 { color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }
+        h2 { color: #34495e; margin-top: 30px; }
+        h3 { color: #2980b9; margin-top: 20px; }
+        .highlight { background: #e3f2fd; border-left: 4px solid #2196f3; padding: 15px; margin: 20px 0; }
+"""
+
+HTML_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>HVAC Market Analysis Report</title>
+    <style>$css    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>HVAC Market Analysis Report</h1>
+        <div class="highlight">
+            <p><strong>Generated:</strong> $stamp</p>
+            <p><strong>Brands:</strong> $brands</p>
+        </div>
+        <h2>Executive Summary</h2>
+        <p>This report analyzes $n_data data points from $n_brands major HVAC brands.</p>
+        <h2>Brand Analysis</h2>
+$rows
+    </div>
+</body>
+</html>
+""")
 
 # Create report directory
 os.makedirs('report', exist_ok=True)
 print("Created report/ directory")
 
 # Load data
-config = json.load(open('analysis_config.json'))
-data = json.load(open('collected_data.json'))
-bosch = json.load(open('bosch_deep_analysis.json'))
+with ThreadPoolExecutor(max_workers=3) as executor:
+    config, data, bosch = executor.map(
+        load_json, ['analysis_config.json', 'collected_data.json', 'bosch_deep_analysis.json'])
+
+# Values shared by the Markdown, HTML and index output
+now = datetime.now()
+stamp = now.strftime('%Y-%m-%d %H:%M:%S')
+brands_str = ', '.join(config['target_brands'])
+n_data = len(data)
+n_brands = len(config['target_brands'])
 
 # Generate filename with topic + date
 topic = "comprehensive_market_analysis"
-date_str = datetime.now().strftime("%Y%m%d_%H%M")
+date_str = now.strftime("%Y%m%d_%H%M")
 md_filename = f"{topic}_{date_str}.md"
 html_filename = f"{topic}_{date_str}.html"
 
 # Generate markdown report
-md_content = f"""# HVAC Market Analysis Report
+md_parts = [f"""# HVAC Market Analysis Report
 
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Target Brands: {', '.join(config['target_brands'])}
+Generated: {stamp}
+Target Brands: {brands_str}
 BOSCH Priority: {config['bosch_priority']}
 
 ## Executive Summary
 
-This report analyzes {len(data)} data points from {len(config['target_brands'])} major HVAC brands.
+This report analyzes {n_data} data points from {n_brands} major HVAC brands.
 
 ### Key Findings
 
@@ -37,77 +88,45 @@ This report analyzes {len(data)} data points from {len(config['target_brands'])}
 
 ## Brand Analysis
 
-"""
+"""]
 
 # Add brand data
 for item in data:
-    md_content += f"### {item['brand']}\n"
-    md_content += f"- Source: {item['source']}\n"
-    md_content += f"- Content: {item['content']}\n"
-    md_content += f"- Type: {item['data_type']}\n\n"
+    md_parts.append(f"### {item['brand']}\n- Source: {item['source']}\n"
+                    f"- Content: {item['content']}\n- Type: {item['data_type']}\n\n")
 
 # Add BOSCH analysis
 if bosch:
-    md_content += "## BOSCH Deep Analysis\n\n"
-    for key in bosch.keys():
-        md_content += f"### {key.replace('_', ' ').title()}\n"
-        md_content += f"- Available: {len(bosch[key])} data points\n\n"
+    md_parts.append("## BOSCH Deep Analysis\n\n")
+    for key, value in bosch.items():
+        md_parts.append(f"### {key.replace('_', ' ').title()}\n- Available: {len(value)} data points\n\n")
+
+md_content = "".join(md_parts)
 
 # Save markdown report
 md_path = f"report/{md_filename}"
-with open(md_path, 'w', encoding='utf-8') as f:
-    f.write(md_content)
+with open(md_path, 'wb', buffering=1 << 20) as f:
+    f.write(md_content.encode('utf-8'))
 
 print(f"Markdown report saved: {md_path}")
 
 # Generate HTML report
-html_content = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>HVAC Market Analysis Report</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; max-width: 1000px; margin: 40px auto; padding: 20px; background: #f5f5f5; }}
-        .container {{ background: white; padding: 40px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); }}
-        h1 {{ color: #2c3e50; border-bottom: 3px solid #3498db; padding-bottom: 10px; }}
-        h2 {{ color: #34495e; margin-top: 30px; }}
-        h3 {{ color: #2980b9; margin-top: 20px; }}
-        .highlight {{ background: #e3f2fd; border-left: 4px solid #2196f3; padding: 15px; margin: 20px 0; }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>HVAC Market Analysis Report</h1>
-        <div class="highlight">
-            <p><strong>Generated:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p><strong>Brands:</strong> {', '.join(config['target_brands'])}</p>
-        </div>
-        <h2>Executive Summary</h2>
-        <p>This report analyzes {len(data)} data points from {len(config['target_brands'])} major HVAC brands.</p>
-        <h2>Brand Analysis</h2>
-"""
-
-for item in data:
-    html_content += f"<h3>{item['brand']}</h3>"
-    html_content += f"<p><strong>{item['source']}:</strong> {item['content']}</p>"
-
-html_content += """
-    </div>
-</body>
-</html>
-"""
+rows = "".join(f"<h3>{item['brand']}</h3><p><strong>{item['source']}:</strong> {item['content']}</p>"
+               for item in data)
+html_content = HTML_TEMPLATE.substitute(
+    css=CSS, stamp=stamp, brands=brands_str, n_data=n_data, n_brands=n_brands, rows=rows)
 
 # Save HTML report
 html_path = f"report/{html_filename}"
-with open(html_path, 'w', encoding='utf-8') as f:
-    f.write(html_content)
+with open(html_path, 'wb', buffering=1 << 20) as f:
+    f.write(html_content.encode('utf-8'))
 
 print(f"HTML report saved: {html_path}")
 
 # Create index
 index_content = f"""# HVAC Market Analysis Reports
 
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated: {stamp}
 
 ## Available Reports
 
@@ -118,8 +137,8 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 """
 
 index_path = "report/README.md"
-with open(index_path, 'w', encoding='utf-8') as f:
-    f.write(index_content)
+with open(index_path, 'wb', buffering=1 << 20) as f:
+    f.write(index_content.encode('utf-8'))
 
 print(f"Index created: {index_path}")
 print("\nDemo complete!")
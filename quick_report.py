@@ -1,12 +1,23 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+def load_json(path):
+    with open(path, 'rb') as f:
+        return _loads(f.read())
 
 # Load data
-config = json.load(open('analysis_config.json'))
-data = json.load(open('collected_data.json'))
-bosch = json.load(open('bosch_deep_analysis.json'))
+with ThreadPoolExecutor(max_workers=3) as executor:
+    config, data, bosch = executor.map(
+        load_json, ['analysis_config.json', 'collected_data.json', 'bosch_deep_analysis.json'])
 
 # Generate report
-report = f"""# HVAC Market Analysis Report
+parts = [f"""# HVAC Market Analysis Report
 
 Generated: 2024-01-20
 Target Brands: {', '.join(config['target_brands'])}
@@ -24,29 +35,29 @@ This report analyzes {len(data)} data points from {len(config['target_brands'])}
 
 ## Brand Analysis
 
-"""
+"""]
 
 # Add brand data
 for item in data:
-    report += f"### {item['brand']}\n"
-    report += f"- Source: {item['source']}\n"
-    report += f"- Content: {item['content']}\n"
-    report += f"- Type: {item['data_type']}\n\n"
+    parts.append(f"### {item['brand']}\n- Source: {item['source']}\n"
+                 f"- Content: {item['content']}\n- Type: {item['data_type']}\n\n")
 
 # Add BOSCH analysis
 if bosch:
-    report += "## BOSCH Deep Analysis\n\n"
+    parts.append("## BOSCH Deep Analysis\n\n")
     for key, value in bosch.items():
-        report += f"### {key.replace('_', ' ').title()}\n"
+        parts.append(f"### {key.replace('_', ' ').title()}\n")
         if isinstance(value, dict):
             for subkey, subvalue in value.items():
                 if isinstance(subvalue, list):
-                    report += f"- {subkey}: {len(subvalue)} items\n"
-        report += "\n"
+                    parts.append(f"- {subkey}: {len(subvalue)} items\n")
+        parts.append("\n")
+
+report = "".join(parts)
 
 # Save report
-with open('demo_report.md', 'w', encoding='utf-8') as f:
-    f.write(report)
+with open('demo_report.md', 'wb', buffering=1 << 20) as f:
+    f.write(report.encode('utf-8'))
 
 print("Report generated: demo_report.md")
 print(f"Total lines: {len(report.splitlines())}")
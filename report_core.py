@@ -0,0 +1,793 @@
+#!/usr/bin/env python3
+"""
+HVAC Business Analyst Skill - Report Core
+Shared implementation behind the report generator scripts
+- simple: compact report (generate_report_simple.py)
+- full: detailed report (generate_report.py)
+- optimized: dated reports in report/ with an index (optimized_report_generator.py)
+"""
+
+import io
+import json
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from datetime import datetime
+from itertools import islice
+from operator import attrgetter
+from typing import List, Optional
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import cmarkgfm
+except ImportError:
+    cmarkgfm = None
+
+def ensure_report_directory():
+    """Ensure report directory exists"""
+    if not os.path.exists('report'):
+        os.makedirs('report')
+        print("✅ Created report/ directory")
+
+def generate_report_filename(topic="hvac_market_analysis", extension="md"):
+    """Generate report filename with topic + date format"""
+    date_str = datetime.now().strftime("%Y%m%d_%H%M")
+    filename = f"{topic}_{date_str}.{extension}"
+    return filename
+
+@dataclass
+class Record:
+    """Collected data point fields used by the report"""
+    brand: Optional[str] = 'Unknown'
+    data_type: Optional[str] = 'other'
+    source: Optional[str] = 'N/A'
+    content: Optional[str] = 'N/A'
+
+_RECORD_FIELDS = frozenset(f.name for f in fields(Record))
+
+if msgspec is not None:
+    _decode_records = msgspec.json.Decoder(List[Record]).decode
+else:
+    def _decode_records(raw):
+        return [Record(**{k: v for k, v in item.items() if k in _RECORD_FIELDS})
+                for item in _loads(raw)]
+
+# Raw file bytes per path: (mtime, bytes); a rewritten file replaces its entry.
+# Decoding on every call gives each caller its own objects.
+_json_cache = {}
+
+_DECODE_ERRORS = (json.JSONDecodeError, msgspec.DecodeError) if msgspec else (json.JSONDecodeError,)
+
+def _load_cached(filepath, decode):
+    try:
+        mtime = os.stat(filepath).st_mtime_ns
+        cached = _json_cache.get(filepath)
+        if cached is None or cached[0] != mtime:
+            with open(filepath, 'rb') as f:
+                cached = _json_cache[filepath] = (mtime, f.read())
+        return decode(cached[1])
+    except FileNotFoundError:
+        print(f"⚠️  File not found: {filepath}")
+        return None
+    except _DECODE_ERRORS as e:
+        print(f"⚠️  JSON decode error: {e}")
+        return None
+
+def load_json(filepath):
+    """Load JSON file safely"""
+    return _load_cached(filepath, _loads)
+
+def load_records(filepath):
+    """Load collected data points as Record objects"""
+    return _load_cached(filepath, _decode_records)
+
+def load_inputs():
+    """Load config, collected data and BOSCH analysis concurrently"""
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        config = executor.submit(load_json, 'analysis_config.json')
+        data = executor.submit(load_records, 'collected_data.json')
+        bosch = executor.submit(load_json, 'bosch_deep_analysis.json')
+        return config.result(), data.result(), bosch.result()
+
+def group_by(items, attr):
+    """Group records by the value of one attribute"""
+    groups = defaultdict(list)
+    key = attrgetter(attr)
+    for item in items:
+        groups[key(item)].append(item)
+    return groups
+
+def _write_simple_markdown(out, topic):
+    """Write the compact report layout"""
+    config, data, bosch = load_inputs()
+    data = data or []
+    config = config or {}
+    brands_list = config.get('target_brands', [])
+
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    write = out.write
+    write(f"""# HVAC Market Analysis Report
+
+Generated: {timestamp}
+Target Brands: {', '.join(brands_list) if config else 'N/A'}
+
+## Executive Summary
+
+This report analyzes {len(data)} data points from {len(brands_list)} major HVAC brands.
+
+## Brand Analysis
+""")
+
+    if data:
+        brands = group_by(data, 'brand')
+
+        for brand, items in brands.items():
+            write(f"\n### {brand}\n")
+            write(f"Data Points: {len(items)}\n")
+            for item in islice(items, 3):
+                write(f"- {item.source}: {item.content}\n")
+
+    if bosch:
+        write("\n## BOSCH Deep Analysis ⭐\n")
+        if bosch.get('product_innovation', {}).get('new_product_launches'):
+            write("\n### Product Innovation\n")
+            for item in bosch['product_innovation']['new_product_launches']:
+                write(f"- {item.get('content', '')}\n")
+
+def _write_full_markdown(out, topic):
+    """Write the detailed report layout"""
+    # Load data
+    config, data, bosch_analysis = load_inputs()
+    data = data or []
+
+    # Read the config fields used by the header once
+    config = config or {}
+    brands_list = config.get('target_brands', [])
+    brand_str = ', '.join(brands_list) if config else 'N/A'
+    time_range = config.get('time_range', {})
+    start, end = time_range.get('start', 'N/A'), time_range.get('end', 'N/A')
+
+    now = datetime.now()
+    timestamp = now.strftime('%Y-%m-%d %H:%M:%S')
+    date_str = now.strftime('%Y-%m-%d')
+
+    write = out.write
+    write(f"""# HVAC Market Analysis Report
+
+**Generated**: {timestamp}
+**Analysis Goal**: {config.get('analysis_goal', 'N/A')}
+**Target Brands**: {brand_str}
+**Geographic Scope**: {config.get('geographic_scope', 'N/A')}
+
+---
+
+## Executive Summary
+
+This report analyzes the North American HVAC market covering {len(data)} data points from {len(brands_list)} major brands.
+
+### Key Findings
+
+- **Data Coverage**: {len(data)} data points collected
+- **BOSCH Priority Analysis**: {'Enabled' if bosch_analysis else 'Disabled'}
+- **Time Range**: {start} to {end}
+
+---
+
+## 1. Market Overview
+
+### 1.1 Industry Background
+
+The North American HVAC market is one of the most mature and competitive markets globally. Key characteristics:
+
+- **Market Size**: Continuous growth with 3-5% CAGR
+- **Technology Driven**: Clear trends in smart and energy-efficient solutions
+- **Policy Impact**: DOE efficiency standards driving industry innovation
+- **Climate Factors**: Climate change increasing demand for efficient HVAC systems
+
+### 1.2 Major Players
+
+{brand_str}
+
+---
+
+## 2. Brand Analysis
+
+""")
+
+    # Add brand-specific data
+    if data:
+        brands = group_by(data, 'brand')
+
+        for i, (brand, items) in enumerate(brands.items(), 1):
+            write(f"### 2.{i} {brand} Analysis\n\n")
+            write(f"**Data Points**: {len(items)}\n\n")
+
+            # Group by data type
+            by_type = group_by(items, 'data_type')
+
+            for dtype, type_items in by_type.items():
+                write(f"#### {dtype.title()}\n\n")
+                for item in islice(type_items, 3):  # Show max 3 items
+                    write(f"- **{item.source}**: {item.content}\n")
+                write("\n")
+
+    # Add BOSCH deep analysis
+    if bosch_analysis:
+        write("""
+---
+
+## 3. BOSCH Deep Analysis ⭐
+
+**Note**: The following is a specialized deep analysis of BOSCH across 8 dimensions.
+
+""")
+
+        # Product Innovation
+        if 'product_innovation' in bosch_analysis:
+            write("### 3.1 Product Innovation\n\n")
+            if bosch_analysis['product_innovation'].get('new_product_launches'):
+                for item in bosch_analysis['product_innovation']['new_product_launches']:
+                    write(f"- **{item.get('timestamp', '')}**: {item.get('content', '')}\n")
+            write("\n")
+
+        # Market Positioning
+        if 'market_positioning' in bosch_analysis:
+            write("### 3.2 Market Positioning\n\n")
+            if bosch_analysis['market_positioning'].get('target_segments'):
+                for item in bosch_analysis['market_positioning']['target_segments']:
+                    write(f"- {item.get('segment', '')}\n")
+            write("\n")
+
+        # Financial Performance
+        if 'financial_performance' in bosch_analysis:
+            write("### 3.3 Financial Performance\n\n")
+            if bosch_analysis['financial_performance'].get('revenue_data'):
+                for item in bosch_analysis['financial_performance']['revenue_data']:
+                    write(f"- **{item.get('timestamp', '')}**: {item.get('data', '')}\n")
+            write("\n")
+
+    # Add conclusions
+    write(f"""
+---
+
+## 4. Conclusions & Recommendations
+
+### 4.1 Key Conclusions
+
+1. **Market Competition**: Intense competition among major brands
+2. **Technology Innovation**: Continuous focus on R&D and innovation
+3. **Policy Impact**: DOE standards driving industry transformation
+4. **BOSCH Performance**: Strong position in premium market segment
+
+### 4.2 Strategic Recommendations
+
+- **For BOSCH**: Continue investing in technology leadership
+- **For Market**: Monitor DOE policy changes closely
+- **For All Players**: Focus on energy efficiency and smart features
+
+---
+
+## Appendix: Data Sources
+
+### Data Collection Summary
+
+- **Total Data Points**: {len(data)}
+- **Data Sources**: Multiple official and industry sources
+- **Collection Method**: Automated collection with quality validation
+- **BOSCH Special Analysis**: 8-dimensional deep dive
+
+### Main Data Sources
+
+- DOE (Department of Energy)
+- AHRI (Air-Conditioning, Heating, and Refrigeration Institute)
+- EPA (Environmental Protection Agency)
+- Brand Official Websites
+- Industry News Sources
+
+---
+
+**Report Generated by**: HVAC Business Analyst Skill
+**Version**: v1.0
+**Date**: {date_str}
+""")
+
+def _write_optimized_markdown(out, topic):
+    """Write the comprehensive report layout"""
+    # Load data
+    config, data, bosch = load_inputs()
+    data = data or []
+
+    # Read the config fields used by the header once
+    config = config or {}
+    brands_list = config.get('target_brands', [])
+    time_range = config.get('time_range', {})
+    start, end = time_range.get('start', 'N/A'), time_range.get('end', 'N/A')
+
+    now = datetime.now()
+    timestamp = now.strftime('%Y-%m-%d %H:%M:%S')
+    date_str = now.strftime('%Y-%m-%d')
+
+    write = out.write
+    write(f"""# HVAC Market Analysis Report - {topic.replace('_', ' ').title()}
+
+**Generated**: {timestamp}
+**Report Type**: {topic.replace('_', ' ').title()}
+**Version**: v1.0
+
+---
+
+## Executive Summary
+
+This comprehensive report analyzes the North American HVAC market, covering:
+
+- **Brands Analyzed**: {len(brands_list) if config else 'N/A'}
+- **Data Points Collected**: {len(data)}
+- **Geographic Scope**: {config.get('geographic_scope', 'National')}
+- **BOSCH Priority Analysis**: {'Enabled' if bosch else 'Disabled'}
+- **Time Range**: {start} to {end}
+
+### Key Findings
+
+1. **Market Competition**: Intense competition among major HVAC brands
+2. **Technology Leadership**: Smart HVAC and energy efficiency driving innovation
+3. **Policy Impact**: DOE standards reshaping industry requirements
+4. **BOSCH Position**: Strong premium market presence with growth trajectory
+5. **Regional Opportunities**: Southern markets showing particular promise
+
+---
+
+## 1. Market Overview
+
+### 1.1 Industry Characteristics
+
+The North American HVAC market demonstrates:
+
+- **Continuous Growth**: 3-5% CAGR with strong demand drivers
+- **Technology Innovation**: Smart systems and IoT integration
+- **Policy-Driven Change**: DOE efficiency standards driving transformation
+- **Climate Impact**: Extreme weather increasing system demand
+
+### 1.2 Market Participants
+
+""")
+
+    # Add brand analysis
+    if data:
+        brands = group_by(data, 'brand')
+
+        for i, (brand, items) in enumerate(brands.items(), 1):
+            write(f"#### 1.2.{i} {brand} Analysis\n\n")
+            write(f"**Data Points**: {len(items)}\n\n")
+
+            # Group by data type
+            by_type = group_by(items, 'data_type')
+
+            for dtype, type_items in by_type.items():
+                write(f"**{dtype.title()} Updates**:\n")
+                for item in islice(type_items, 3):  # Show max 3 items
+                    write(f"- **{item.source}**: {item.content}\n")
+                write("\n")
+
+    # Add BOSCH deep analysis
+    if bosch:
+        write("""
+---
+
+## 2. BOSCH Deep Analysis ⭐
+
+**Note**: This section employs our specialized 8-dimensional methodology for comprehensive BOSCH market assessment.
+
+""")
+
+        for i, (key, value) in enumerate(bosch.items(), 1):
+            section_name = key.replace('_', ' ').title()
+            write(f"### 2.{i} {section_name}\n\n")
+
+            if isinstance(value, dict):
+                for subkey, subvalue in value.items():
+                    if isinstance(subvalue, list) and subvalue:
+                        write(f"**{subkey.replace('_', ' ').title()}**:\n")
+                        for item in subvalue:
+                            if isinstance(item, dict):
+                                content = item.get('content', item.get('description', item.get('data', '')))
+                                if content:
+                                    write(f"- {content}\n")
+                        write("\n")
+                    elif isinstance(subvalue, str):
+                        write(f"- {subvalue}\n")
+            write("\n")
+
+    # Add conclusions
+    write(f"""
+---
+
+## 3. Conclusions & Recommendations
+
+### 3.1 Key Conclusions
+
+1. **Technology Leadership Critical**: Smart features and efficiency are key differentiators
+2. **Policy Impact Significant**: DOE standards driving industry transformation
+3. **Market Competition Intense**: All major brands investing heavily in innovation
+4. **BOSCH Strong Position**: Premium market presence with clear growth strategy
+5. **Regional Opportunities**: Southern markets showing particular promise
+
+### 3.2 Strategic Recommendations
+
+#### For BOSCH:
+- Continue technology leadership investment in AI and IoT
+- Accelerate Southern market expansion strategy
+- Leverage premium positioning for margin protection
+- Strengthen patent portfolio and IP protection
+
+#### For Industry:
+- Monitor DOE policy changes closely for compliance
+- Invest in energy efficiency R&D capabilities
+- Develop smart home integration capabilities
+- Strengthen dealer and service networks
+
+#### For Market Entry:
+- Focus on energy-efficient product portfolios
+- Target policy-friendly regions for initial entry
+- Build strong local service and support networks
+- Consider strategic partnerships for market access
+
+---
+
+## Appendix
+
+### A.1 Data Sources
+
+- DOE (Department of Energy)
+- AHRI (Air-Conditioning, Heating, and Refrigeration Institute)
+- EPA (Environmental Protection Agency)
+- Brand Official Websites
+- Industry News Sources
+- State Energy Offices
+
+### A.2 Methodology
+
+- Multi-source data collection and validation
+- BOSCH 8-dimensional deep analysis framework
+- Policy impact assessment using DOE guidelines
+- Market trend identification and forecasting
+
+### A.3 Report Information
+
+- **Generated By**: HVAC Business Analyst Skill
+- **Version**: v1.0
+- **Date**: {date_str}
+- **Geographic Scope**: North America
+- **Analysis Depth**: Comprehensive with BOSCH Special Focus
+
+---
+
+*This report is generated using advanced market analysis techniques and should be used in conjunction with other market intelligence sources.*
+""")
+
+# Headings (# .. ####) and horizontal rules, converted in a single regex pass
+_BLOCK_RE = re.compile(r'^(?:(#{1,4}) (.*)|---)$', re.MULTILINE)
+
+def _render_block(match):
+    if match.group(1) is None:
+        return '<hr>'
+    level = len(match.group(1))
+    return f'<h{level}>{match.group(2)}</h{level}>'
+
+def convert_markdown_to_html(markdown_content, line_breaks=False):
+    """Convert markdown to HTML, using cmarkgfm when it is installed"""
+    if cmarkgfm is not None:
+        return cmarkgfm.github_flavored_markdown_to_html(markdown_content)
+    html = _BLOCK_RE.sub(_render_block, markdown_content)
+    if line_breaks:
+        html = '\n'.join(line if line.startswith('<h') else line + '<br>' for line in html.split('\n'))
+    return html
+
+def _simple_html(markdown_content, topic):
+    """Compact HTML page"""
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="UTF-8"><title>HVAC Report</title>
+<style>
+body {{font-family: Arial, sans-serif; max-width: 1000px; margin: 40px auto; padding: 20px; background: #f5f5f5;}}
+.container {{background: white; padding: 40px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);}}
+h1 {{color: #2c3e50; border-bottom: 3px solid #3498db;}}
+h2 {{color: #34495e; margin-top: 30px;}}
+</style>
+</head><body><div class="container">
+{convert_markdown_to_html(markdown_content, line_breaks=True)}
+</div></body></html>"""
+
+def _full_html(markdown_content, topic):
+    """Detailed HTML page"""
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>HVAC Market Analysis Report</title>
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1000px;
+            margin: 0 auto;
+            padding: 40px;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        }}
+        .container {{
+            background: white;
+            padding: 40px;
+            border-radius: 10px;
+            box-shadow: 0 10px 40px rgba(0,0,0,0.2);
+        }}
+        h1 {{
+            color: #2c3e50;
+            border-bottom: 3px solid #667eea;
+            padding-bottom: 10px;
+        }}
+        h2 {{
+            color: #34495e;
+            margin-top: 30px;
+            border-left: 4px solid #667eea;
+            padding-left: 15px;
+        }}
+        h3 {{
+            color: #2980b9;
+            margin-top: 20px;
+        }}
+        code {{
+            background: #f4f4f4;
+            padding: 2px 6px;
+            border-radius: 3px;
+        }}
+        .highlight {{
+            background: #fff3cd;
+            border-left: 4px solid #ffc107;
+            padding: 15px;
+            margin: 20px 0;
+        }}
+        .bosch-highlight {{
+            background: #e3f2fd;
+            border-left: 4px solid #2196f3;
+            padding: 15px;
+            margin: 20px 0;
+        }}
+        ul {{
+            margin: 15px 0;
+        }}
+        li {{
+            margin: 8px 0;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        {convert_markdown_to_html(markdown_content)}
+    </div>
+</body>
+</html>"""
+
+def _optimized_html(markdown_content, topic):
+    """Comprehensive HTML page with footer"""
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    # Simple markdown to HTML conversion
+    html_content = convert_markdown_to_html(markdown_content)
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>HVAC Market Analysis Report - {topic.replace('_', ' ').title()}</title>
+    <style>
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            padding: 20px;
+        }}
+        .container {{
+            max-width: 1100px;
+            margin: 0 auto;
+            background: white;
+            padding: 50px;
+            border-radius: 15px;
+            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
+        }}
+        h1 {{
+            color: #2c3e50;
+            font-size: 2.5em;
+            margin-bottom: 15px;
+            border-bottom: 3px solid #667eea;
+            padding-bottom: 10px;
+        }}
+        h2 {{
+            color: #34495e;
+            font-size: 1.8em;
+            margin-top: 35px;
+            margin-bottom: 20px;
+            border-left: 5px solid #667eea;
+            padding-left: 15px;
+        }}
+        h3 {{
+            color: #2980b9;
+            font-size: 1.4em;
+            margin-top: 25px;
+            margin-bottom: 15px;
+        }}
+        h4 {{
+            color: #34495e;
+            font-size: 1.1em;
+            margin-top: 20px;
+            margin-bottom: 10px;
+        }}
+        p {{
+            margin-bottom: 15px;
+            text-align: justify;
+        }}
+        ul, ol {{
+            margin-bottom: 15px;
+            padding-left: 25px;
+        }}
+        li {{
+            margin-bottom: 8px;
+        }}
+        .highlight {{
+            background: #fff3cd;
+            border-left: 4px solid #ffc107;
+            padding: 15px 20px;
+            margin: 20px 0;
+            border-radius: 5px;
+        }}
+        .bosch-section {{
+            background: #e3f2fd;
+            border-left: 5px solid #2196f3;
+            padding: 20px;
+            margin: 25px 0;
+            border-radius: 5px;
+        }}
+        hr {{
+            border: none;
+            height: 2px;
+            background: #667eea;
+            margin: 30px 0;
+        }}
+        code {{
+            background: #f4f4f4;
+            padding: 2px 6px;
+            border-radius: 3px;
+            font-family: 'Courier New', monospace;
+        }}
+        footer {{
+            margin-top: 50px;
+            padding-top: 20px;
+            border-top: 2px solid #e9ecef;
+            text-align: center;
+            color: #7f8c8d;
+            font-size: 0.9em;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        {html_content}
+        <footer>
+            <p><strong>HVAC Business Analyst Skill</strong></p>
+            <p>Generated: {timestamp}</p>
+            <p><em>Advanced Market Intelligence & Analysis</em></p>
+        </footer>
+    </div>
+</body>
+</html>"""
+
+def create_report_index():
+    """Create an index of all reports"""
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    index_content = f"""# HVAC Market Analysis Reports
+
+Generated: {timestamp}
+
+## Available Reports
+
+"""
+
+    md_files, html_files = [], []
+    try:
+        with os.scandir('report') as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith('.md'):
+                    md_files.append(name)
+                elif name.endswith('.html'):
+                    html_files.append(name)
+        has_report_dir = True
+    except FileNotFoundError:
+        has_report_dir = False
+
+    if has_report_dir:
+        index_content += "### Markdown Reports\n\n"
+        for filename in sorted(md_files):
+            index_content += f"- [{filename}](./{filename})\n"
+
+        index_content += "\n### HTML Reports\n\n"
+        for filename in sorted(html_files):
+            index_content += f"- [{filename}](./{filename})\n"
+
+        index_content += f"\n---\n\n**Total Reports**: {len(md_files)} Markdown + {len(html_files)} HTML\n"
+        index_content += f"**Last Updated**: {timestamp}\n"
+
+    # Save index
+    index_path = "report/README.md"
+    with open(index_path, 'wb') as f:
+        f.write(index_content.encode('utf-8'))
+
+    return index_path
+
+# Markdown writer and HTML page for each report style
+STYLES = {
+    'simple': (_write_simple_markdown, _simple_html),
+    'full': (_write_full_markdown, _full_html),
+    'optimized': (_write_optimized_markdown, _optimized_html),
+}
+
+def _style(style):
+    try:
+        return STYLES[style]
+    except KeyError:
+        raise ValueError(f"Unknown report style: {style!r} (expected one of {', '.join(STYLES)})")
+
+def render_markdown(topic="comprehensive_analysis", style="optimized"):
+    """Render the Markdown report for a style"""
+    write_markdown, _ = _style(style)
+    buffer = io.StringIO()
+    write_markdown(buffer, topic)
+    return buffer.getvalue()
+
+def render_html(markdown_content, topic="comprehensive_analysis", style="optimized"):
+    """Render the HTML page for a style from Markdown content"""
+    _, html_page = _style(style)
+    return html_page(markdown_content, topic)
+
+def write_text(filepath, content):
+    """Write UTF-8 text in one binary write"""
+    with open(filepath, 'wb') as f:
+        f.write(content.encode('utf-8'))
+    return filepath
+
+def report_paths(topic="comprehensive_analysis", style="optimized"):
+    """Markdown and HTML output paths for a style"""
+    if style == 'optimized':
+        return (f"report/{generate_report_filename(topic, 'md')}",
+                f"report/{generate_report_filename(topic, 'html')}")
+    return f"{topic}.md", f"{topic}.html"
+
+def build_report(topic="comprehensive_analysis", style="optimized"):
+    """Render and save the Markdown and HTML reports, returning their paths"""
+    _style(style)
+    md_filepath, html_filepath = report_paths(topic, style)
+    if style == 'optimized':
+        ensure_report_directory()
+
+    markdown_content = render_markdown(topic, style)
+    write_text(md_filepath, markdown_content)
+    write_text(html_filepath, render_html(markdown_content, topic, style))
+
+    if style == 'optimized':
+        create_report_index()
+    return md_filepath, html_filepath
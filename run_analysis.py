@@ -7,18 +7,229 @@ HVAC首席商业分析师技能 - 自动化运行脚本
 import os
 import sys
 import json
-import time
 from datetime import datetime
+from functools import lru_cache
 
-def create_default_config():
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dump_json(obj, path):
+    """以2空格缩进写出JSON，安装了orjson时使用orjson"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+
+# 演示用的固定数据，预先序列化为JSON文本直接写盘
+_MOCK_DATA_JSON = """[
+  {
+    "source": "carrier.com",
+    "url": "https://www.carrier.com/newsroom/",
+    "content": "Carrier推出新一代智能HVAC系统，集成AI技术实现节能30%",
+    "data_type": "product",
+    "timestamp": "2024-01-15T10:00:00",
+    "brand": "Carrier",
+    "sensitivity": "public",
+    "confidence": 1.0,
+    "metadata": {
+      "collection_method": "mock"
+    }
+  },
+  {
+    "source": "trane.com",
+    "url": "https://www.trane.com/news/",
+    "content": "Trane发布2024年产品线，新增变频技术和智能温控",
+    "data_type": "product",
+    "timestamp": "2024-01-20T14:00:00",
+    "brand": "Trane",
+    "sensitivity": "public",
+    "confidence": 1.0,
+    "metadata": {
+      "collection_method": "mock"
+    }
+  },
+  {
+    "source": "bosch.com",
+    "url": "https://www.bosch.com/innovation/",
+    "content": "BOSCH在HVAC技术创新方面取得重大突破，推出革命性热泵技术",
+    "data_type": "technical",
+    "timestamp": "2024-01-10T09:00:00",
+    "brand": "BOSCH",
+    "sensitivity": "public",
+    "confidence": 1.0,
+    "metadata": {
+      "collection_method": "mock",
+      "bosch_priority": true
+    }
+  },
+  {
+    "source": "DOE",
+    "url": "https://www.energy.gov/",
+    "content": "DOE发布新的HVAC能效标准，将于2025年生效",
+    "data_type": "policy",
+    "timestamp": "2024-01-05T08:00:00",
+    "brand": null,
+    "sensitivity": "public",
+    "confidence": 1.0,
+    "metadata": {
+      "collection_method": "mock"
+    }
+  }
+]"""
+
+_BOSCH_ANALYSIS_JSON = """{
+  "product_innovation": {
+    "new_product_launches": [
+      {
+        "source": "bosch.com",
+        "content": "BOSCH推出2024年智能HVAC产品线",
+        "timestamp": "2024-01-15T10:00:00"
+      }
+    ],
+    "technology_advancements": [
+      {
+        "source": "bosch-research.com",
+        "description": "BOSCH研发出新型变频技术，能效提升35%",
+        "timestamp": "2024-01-10T09:00:00"
+      }
+    ],
+    "patent_activity": [
+      {
+        "source": "USPTO",
+        "details": "2024年BOSCH获得HVAC相关专利15项",
+        "timestamp": "2024-01-01T00:00:00"
+      }
+    ],
+    "rd_investment": []
+  },
+  "market_positioning": {
+    "target_segments": [
+      {
+        "segment": "高端住宅市场",
+        "source": "bosch.com",
+        "timestamp": "2024-01-15T10:00:00"
+      }
+    ],
+    "pricing_strategy": [
+      {
+        "strategy": "高端定价策略，平均价格高于市场15%",
+        "source": "market-analysis.com",
+        "timestamp": "2024-01-20T14:00:00"
+      }
+    ],
+    "competitive_positioning": [
+      {
+        "position": "技术创新领导者定位",
+        "source": "industry-report.com",
+        "timestamp": "2024-01-10T09:00:00"
+      }
+    ]
+  },
+  "channel_strategy": {
+    "distribution_network": [
+      {
+        "details": "全美50州全覆盖，分销商超过500家",
+        "source": "bosch.com",
+        "timestamp": "2024-01-15T10:00:00"
+      }
+    ],
+    "strategic_partnerships": [
+      {
+        "partner": "与主要建筑承包商建立战略合作",
+        "source": "partnership-news.com",
+        "timestamp": "2024-01-20T14:00:00"
+      }
+    ]
+  },
+  "financial_performance": {
+    "revenue_data": [
+      {
+        "data": "2024年HVAC业务营收预计增长18%",
+        "source": "financial-report.com",
+        "timestamp": "2024-01-15T10:00:00"
+      }
+    ],
+    "market_investment": [
+      {
+        "investment": "2024年研发投入增加25%",
+        "source": "investment-news.com",
+        "timestamp": "2024-01-10T09:00:00"
+      }
+    ]
+  },
+  "technology_advantage": {
+    "core_technologies": [
+      {
+        "technology": "BOSCH智能温控算法",
+        "source": "tech-analysis.com",
+        "timestamp": "2024-01-15T10:00:00"
+      }
+    ],
+    "technical_differentiators": [
+      {
+        "differentiator": "业界领先的能效比，SEER评级达22",
+        "source": "product-review.com",
+        "timestamp": "2024-01-20T14:00:00"
+      }
+    ]
+  },
+  "competitive_moat": {
+    "brand_strength": [
+      {
+        "strength": "BOSCH品牌在HVAC领域认知度达85%",
+        "source": "brand-survey.com",
+        "timestamp": "2024-01-15T10:00:00"
+      }
+    ]
+  },
+  "strategic_initiatives": {
+    "market_expansion": [
+      {
+        "initiative": "计划2024年进入南部3个新市场",
+        "source": "expansion-news.com",
+        "timestamp": "2024-01-20T14:00:00"
+      }
+    ],
+    "digital_transformation": [
+      {
+        "initiative": "全面数字化转型，实现IoT全覆盖",
+        "source": "digital-news.com",
+        "timestamp": "2024-01-15T10:00:00"
+      }
+    ]
+  },
+  "risk_factors": {
+    "market_risks": [
+      {
+        "risk": "原材料价格上涨压力",
+        "source": "risk-analysis.com",
+        "timestamp": "2024-01-10T09:00:00"
+      }
+    ],
+    "regulatory_risks": [
+      {
+        "risk": "能效标准可能进一步收紧",
+        "source": "regulatory-watch.com",
+        "timestamp": "2024-01-15T10:00:00"
+      }
+    ]
+  }
+}"""
+
+def create_default_config(now=None):
     """创建默认分析配置"""
+    now = now or datetime.now()
     config = {
         "analysis_goal": "6",
         "target_brands": ["Carrier", "Trane", "BOSCH", "Lennox", "Goodman/Daikin"],
         "bosch_priority": True,
         "time_range": {
             "start": "2021-01-01",
-            "end": datetime.now().strftime("%Y-%m-%d")
+            "end": now.strftime("%Y-%m-%d")
         },
         "geographic_scope": "national",
         "analysis_depth": "standard",
@@ -33,220 +244,41 @@ def create_default_config():
             "州级激励政策网站"
         ],
         "output_formats": ["markdown", "html"],
-        "created_at": datetime.now().isoformat()
+        "created_at": now.isoformat()
     }
 
     config_path = "analysis_config.json"
-    with open(config_path, 'w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+    dump_json(config, config_path)
 
     print(f"✅ 已创建默认配置文件: {config_path}")
     return config_path
 
 def create_mock_data():
     """创建模拟数据（用于演示）"""
-    mock_data = [
-        {
-            "source": "carrier.com",
-            "url": "https://www.carrier.com/newsroom/",
-            "content": "Carrier推出新一代智能HVAC系统，集成AI技术实现节能30%",
-            "data_type": "product",
-            "timestamp": "2024-01-15T10:00:00",
-            "brand": "Carrier",
-            "sensitivity": "public",
-            "confidence": 1.0,
-            "metadata": {"collection_method": "mock"}
-        },
-        {
-            "source": "trane.com",
-            "url": "https://www.trane.com/news/",
-            "content": "Trane发布2024年产品线，新增变频技术和智能温控",
-            "data_type": "product",
-            "timestamp": "2024-01-20T14:00:00",
-            "brand": "Trane",
-            "sensitivity": "public",
-            "confidence": 1.0,
-            "metadata": {"collection_method": "mock"}
-        },
-        {
-            "source": "bosch.com",
-            "url": "https://www.bosch.com/innovation/",
-            "content": "BOSCH在HVAC技术创新方面取得重大突破，推出革命性热泵技术",
-            "data_type": "technical",
-            "timestamp": "2024-01-10T09:00:00",
-            "brand": "BOSCH",
-            "sensitivity": "public",
-            "confidence": 1.0,
-            "metadata": {"collection_method": "mock", "bosch_priority": True}
-        },
-        {
-            "source": "DOE",
-            "url": "https://www.energy.gov/",
-            "content": "DOE发布新的HVAC能效标准，将于2025年生效",
-            "data_type": "policy",
-            "timestamp": "2024-01-05T08:00:00",
-            "brand": None,
-            "sensitivity": "public",
-            "confidence": 1.0,
-            "metadata": {"collection_method": "mock"}
-        }
-    ]
-
     data_path = "collected_data.json"
-    with open(data_path, 'w', encoding='utf-8') as f:
-        json.dump(mock_data, f, indent=2, ensure_ascii=False)
+    with open(data_path, 'wb', buffering=1 << 20) as f:
+        f.write(_MOCK_DATA_JSON.encode('utf-8'))
 
     print(f"✅ 已创建模拟数据文件: {data_path}")
     return data_path
 
 def create_bosch_analysis():
     """创建BOSCH深度分析结果"""
-    bosch_analysis = {
-        "product_innovation": {
-            "new_product_launches": [
-                {
-                    "source": "bosch.com",
-                    "content": "BOSCH推出2024年智能HVAC产品线",
-                    "timestamp": "2024-01-15T10:00:00"
-                }
-            ],
-            "technology_advancements": [
-                {
-                    "source": "bosch-research.com",
-                    "description": "BOSCH研发出新型变频技术，能效提升35%",
-                    "timestamp": "2024-01-10T09:00:00"
-                }
-            ],
-            "patent_activity": [
-                {
-                    "source": "USPTO",
-                    "details": "2024年BOSCH获得HVAC相关专利15项",
-                    "timestamp": "2024-01-01T00:00:00"
-                }
-            ],
-            "rd_investment": []
-        },
-        "market_positioning": {
-            "target_segments": [
-                {
-                    "segment": "高端住宅市场",
-                    "source": "bosch.com",
-                    "timestamp": "2024-01-15T10:00:00"
-                }
-            ],
-            "pricing_strategy": [
-                {
-                    "strategy": "高端定价策略，平均价格高于市场15%",
-                    "source": "market-analysis.com",
-                    "timestamp": "2024-01-20T14:00:00"
-                }
-            ],
-            "competitive_positioning": [
-                {
-                    "position": "技术创新领导者定位",
-                    "source": "industry-report.com",
-                    "timestamp": "2024-01-10T09:00:00"
-                }
-            ]
-        },
-        "channel_strategy": {
-            "distribution_network": [
-                {
-                    "details": "全美50州全覆盖，分销商超过500家",
-                    "source": "bosch.com",
-                    "timestamp": "2024-01-15T10:00:00"
-                }
-            ],
-            "strategic_partnerships": [
-                {
-                    "partner": "与主要建筑承包商建立战略合作",
-                    "source": "partnership-news.com",
-                    "timestamp": "2024-01-20T14:00:00"
-                }
-            ]
-        },
-        "financial_performance": {
-            "revenue_data": [
-                {
-                    "data": "2024年HVAC业务营收预计增长18%",
-                    "source": "financial-report.com",
-                    "timestamp": "2024-01-15T10:00:00"
-                }
-            ],
-            "market_investment": [
-                {
-                    "investment": "2024年研发投入增加25%",
-                    "source": "investment-news.com",
-                    "timestamp": "2024-01-10T09:00:00"
-                }
-            ]
-        },
-        "technology_advantage": {
-            "core_technologies": [
-                {
-                    "technology": "BOSCH智能温控算法",
-                    "source": "tech-analysis.com",
-                    "timestamp": "2024-01-15T10:00:00"
-                }
-            ],
-            "technical_differentiators": [
-                {
-                    "differentiator": "业界领先的能效比，SEER评级达22",
-                    "source": "product-review.com",
-                    "timestamp": "2024-01-20T14:00:00"
-                }
-            ]
-        },
-        "competitive_moat": {
-            "brand_strength": [
-                {
-                    "strength": "BOSCH品牌在HVAC领域认知度达85%",
-                    "source": "brand-survey.com",
-                    "timestamp": "2024-01-15T10:00:00"
-                }
-            ]
-        },
-        "strategic_initiatives": {
-            "market_expansion": [
-                {
-                    "initiative": "计划2024年进入南部3个新市场",
-                    "source": "expansion-news.com",
-                    "timestamp": "2024-01-20T14:00:00"
-                }
-            ],
-            "digital_transformation": [
-                {
-                    "initiative": "全面数字化转型，实现IoT全覆盖",
-                    "source": "digital-news.com",
-                    "timestamp": "2024-01-15T10:00:00"
-                }
-            ]
-        },
-        "risk_factors": {
-            "market_risks": [
-                {
-                    "risk": "原材料价格上涨压力",
-                    "source": "risk-analysis.com",
-                    "timestamp": "2024-01-10T09:00:00"
-                }
-            ],
-            "regulatory_risks": [
-                {
-                    "risk": "能效标准可能进一步收紧",
-                    "source": "regulatory-watch.com",
-                    "timestamp": "2024-01-15T10:00:00"
-                }
-            ]
-        }
-    }
-
     analysis_path = "bosch_deep_analysis.json"
-    with open(analysis_path, 'w', encoding='utf-8') as f:
-        json.dump(bosch_analysis, f, indent=2, ensure_ascii=False)
+    with open(analysis_path, 'wb', buffering=1 << 20) as f:
+        f.write(_BOSCH_ANALYSIS_JSON.encode('utf-8'))
 
     print(f"✅ 已创建BOSCH深度分析文件: {analysis_path}")
     return analysis_path
 
+@lru_cache(maxsize=None)
+def load_report_generator():
+    """导入scripts/report_generator中的HVACReportGenerator（只导入一次）"""
+    if 'scripts' not in sys.path:
+        sys.path.insert(0, 'scripts')
+    from report_generator import HVACReportGenerator
+    return HVACReportGenerator
+
 def main():
     """主函数 - 自动化运行整个分析流程"""
     print("=" * 60)
@@ -254,30 +286,26 @@ def main():
     print("=" * 60)
     print()
 
+    # 整个流程共用同一时间戳
+    now = datetime.now()
+
     try:
         # 步骤1: 创建默认配置
         print("📋 步骤1: 创建分析配置...")
-        create_default_config()
-        time.sleep(1)
+        create_default_config(now)
 
         # 步骤2: 创建模拟数据
         print("\n📊 步骤2: 生成模拟数据（用于演示）...")
         create_mock_data()
-        time.sleep(1)
 
         # 步骤3: 创建BOSCH深度分析
         print("\n⭐ 步骤3: 生成BOSCH深度分析...")
         create_bosch_analysis()
-        time.sleep(1)
 
         # 步骤4: 生成报告
         print("\n📝 步骤4: 生成分析报告...")
         try:
-            # 尝试导入report_generator
-            sys.path.append('scripts')
-            from report_generator import HVACReportGenerator
-
-            generator = HVACReportGenerator()
+            generator = load_report_generator()()
             result = generator.generate_complete_report()
 
             print(f"\n✅ 报告生成成功!")
@@ -4,18 +4,40 @@ HVAC Business Analyst Skill - Optimized Demo Runner
 Runs demo with optimized report generation to report/ directory
 """
 
+import compileall
 import os
 import sys
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def write_json(obj, path):
+    """Write obj as 2-space indented JSON in a single write, using orjson when available"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w') as f:
+            f.write(json.dumps(obj, indent=2))
+
 def ensure_report_directory():
     """Ensure report directory exists"""
     if not os.path.exists('report'):
         os.makedirs('report')
         print("✅ Created report/ directory")
 
+def precompile_report_modules():
+    """Byte-compile the report generator modules so repeat runs skip parsing them"""
+    # compile_file skips modules whose cached bytecode is already up to date
+    for module_file in ('optimized_report_generator.py', 'report_core.py'):
+        if os.path.exists(module_file):
+            compileall.compile_file(module_file, quiet=1)
+
 def create_demo_files():
     """Create demo analysis files"""
     print("=" * 60)
@@ -35,10 +57,6 @@ def create_demo_files():
         "created_at": datetime.now().isoformat()
     }
 
-    with open("analysis_config.json", 'w') as f:
-        json.dump(config, f, indent=2)
-    print("[OK] Created analysis_config.json")
-
     # Create demo data
     demo_data = [
         {
@@ -76,10 +94,6 @@ def create_demo_files():
         }
     ]
 
-    with open("collected_data.json", 'w') as f:
-        json.dump(demo_data, f, indent=2)
-    print("[OK] Created collected_data.json")
-
     # Create BOSCH analysis
     bosch_analysis = {
         "product_innovation": {
@@ -118,9 +132,17 @@ def create_demo_files():
         }
     }
 
-    with open("bosch_deep_analysis.json", 'w') as f:
-        json.dump(bosch_analysis, f, indent=2)
-    print("[OK] Created bosch_deep_analysis.json")
+    # The three files are independent; write them concurrently
+    outputs = [
+        (config, "analysis_config.json"),
+        (demo_data, "collected_data.json"),
+        (bosch_analysis, "bosch_deep_analysis.json"),
+    ]
+    with ThreadPoolExecutor(max_workers=len(outputs)) as executor:
+        list(executor.map(lambda output: write_json(*output), outputs))
+
+    for _, path in outputs:
+        print(f"[OK] Created {path}")
 
 def run_report_generator():
     """Run optimized report generator"""
@@ -137,30 +159,42 @@ def main():
     """Main function"""
     # Ensure report directory
     ensure_report_directory()
+    precompile_report_modules()
     
     # Create demo files
     print("\n[1/3] Creating demo files...")
     create_demo_files()
-    time.sleep(1)
 
     # Run report generator
     print("\n[2/3] Generating reports...")
     success = run_report_generator()
-    time.sleep(1)
 
     # Show results
     print("\n[3/3] Displaying results...")
     
     if os.path.exists('report'):
-        md_files = [f for f in os.listdir('report') if f.endswith('.md')]
-        html_files = [f for f in os.listdir('report') if f.endswith('.html')]
-        
+        # Single scandir pass; names only, no stat calls. --quiet prints counts only.
+        quiet = '--quiet' in sys.argv[1:]
+        md_files, html_files = [], []
+        md_count = html_count = 0
+        with os.scandir('report') as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith('.md'):
+                    md_count += 1
+                    if not quiet:
+                        md_files.append(name)
+                elif name.endswith('.html'):
+                    html_count += 1
+                    if not quiet:
+                        html_files.append(name)
+
         print(f"\n📁 Report directory contents:")
-        print(f"   📄 Markdown reports: {len(md_files)}")
+        print(f"   📄 Markdown reports: {md_count}")
         for f in md_files:
             print(f"      - {f}")
-        
-        print(f"   🌐 HTML reports: {len(html_files)}")
+
+        print(f"   🌐 HTML reports: {html_count}")
         for f in html_files:
             print(f"      - {f}")
 
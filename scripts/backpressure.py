@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+HVAC首席商业分析师 - 请求背压控制
+AIMD（加性增、乘性减）自适应并发控制，避免对数据源过载或触发限流
+"""
+
+import asyncio
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 视为数据源过载的HTTP状态码
+OVERLOAD_STATUSES = frozenset({429, 502, 503, 504})
+
+def _is_overload_error(exc: Optional[BaseException]) -> bool:
+    """超时或过载状态码的响应异常（如 aiohttp.ClientResponseError）视为过载"""
+    if exc is None:
+        return False
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    return getattr(exc, 'status', None) in OVERLOAD_STATUSES
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    """解析 Retry-After 头：秒数或HTTP日期"""
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveConcurrency:
+    """AIMD并发控制器
+
+    滚动窗口平均延迟不超过目标时并发上限加 alpha，超过目标时乘以 beta；
+    遇到429/5xx或超时立即执行乘性减。响应头中的 Retry-After 或剩余配额不足10%时主动暂停。
+    """
+
+    def __init__(self, initial: int = 16, minimum: int = 4, maximum: int = 256,
+                 alpha: float = 0.5, beta: float = 0.5, target_latency: float = 1.5,
+                 window: int = 32, adjust_every: int = 8):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.alpha = alpha
+        self.beta = beta
+        self.target_latency = target_latency
+        self.adjust_every = adjust_every
+        self.limit = float(min(max(initial, minimum), maximum))
+        self._latencies = deque(maxlen=window)
+        self._completions = 0
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        self._condition_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def slot(self) -> '_Slot':
+        """占用一个并发名额：async with limiter.slot() as slot: ..."""
+        return _Slot(self)
+
+    def _get_condition(self) -> asyncio.Condition:
+        """在当前事件循环中惰性创建条件变量；事件循环变化时（如多次 asyncio.run）重新创建"""
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+            # 上一个事件循环中未释放的名额已随该循环结束
+            self._in_flight = 0
+        return self._condition
+
+    async def _acquire(self):
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+
+        delay = self._paused_until - time.monotonic()
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except BaseException:
+                # 暂停期间被取消时归还名额
+                async with condition:
+                    self._in_flight -= 1
+                    condition.notify_all()
+                raise
+
+    async def _release(self, latency: float, overloaded: bool):
+        if overloaded:
+            self._decrease()
+        else:
+            self._latencies.append(latency)
+            self._completions += 1
+            if self._completions % self.adjust_every == 0:
+                mean_latency = sum(self._latencies) / len(self._latencies)
+                if mean_latency <= self.target_latency:
+                    self.limit = min(self.maximum, self.limit + self.alpha)
+                else:
+                    self._decrease()
+
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            condition.notify_all()
+
+    def _decrease(self):
+        self.limit = max(self.minimum, self.limit * self.beta)
+        logger.info(f"数据源响应变慢或限流，并发上限降至 {int(self.limit)}")
+
+    def pause(self, seconds: float):
+        """在给定秒数内暂停发出新请求"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def observe_headers(self, headers: Mapping[str, str]):
+        """根据限流相关响应头主动暂停"""
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            delay = _parse_retry_after(retry_after)
+            if delay:
+                self.pause(delay)
+                return
+
+        remaining = headers.get('X-RateLimit-Remaining')
+        quota = headers.get('X-RateLimit-Limit')
+        try:
+            if remaining is not None and quota and int(remaining) < int(quota) * 0.1:
+                self.pause(self.target_latency)
+        except ValueError:
+            pass
+
+class _Slot:
+    """单个请求的并发名额，退出时记录延迟并调整并发上限"""
+
+    def __init__(self, limiter: AdaptiveConcurrency):
+        self._limiter = limiter
+        self._start = 0.0
+        self._overloaded = False
+
+    def observe(self, status: Optional[int] = None, headers: Optional[Mapping[str, str]] = None):
+        """记录响应状态码和响应头（不抛异常的响应需手动调用）"""
+        if status in OVERLOAD_STATUSES:
+            self._overloaded = True
+        if headers:
+            self._limiter.observe_headers(headers)
+
+    def mark_overloaded(self):
+        """标记本次请求过载（调用方自行捕获超时等异常时使用）"""
+        self._overloaded = True
+
+    async def __aenter__(self) -> '_Slot':
+        await self._limiter._acquire()
+        self._start = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        overloaded = self._overloaded or _is_overload_error(exc)
+        await self._limiter._release(time.monotonic() - self._start, overloaded)
+        return False
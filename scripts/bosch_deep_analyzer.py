@@ -4,14 +4,408 @@ HVAC首席商业分析师 - BOSCH深度分析模块
 专门针对BOSCH品牌进行深入分析，不遗漏任何细节
 """
 
+import atexit
+import hashlib
 import json
+import os
+import sqlite3
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import logging
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 logger = logging.getLogger(__name__)
 
+# 各分析维度包含的全部子项（部分子项暂无自动分类规则，保持为空列表）
+DIMENSION_BUCKETS = {
+    'product_innovation': [
+        'new_product_launches', 'technology_advancements', 'patent_activity', 'rd_investment',
+        'innovation_partnerships', 'market_firsts', 'product_line_expansion'
+    ],
+    'market_positioning': [
+        'target_segments', 'pricing_strategy', 'value_proposition', 'market_share_data',
+        'competitive_positioning', 'brand_perception'
+    ],
+    'channel_strategy': [
+        'distribution_network', 'strategic_partnerships', 'direct_sales', 'dealer_network',
+        'online_channels', 'service_network'
+    ],
+    'financial_performance': [
+        'revenue_data', 'profitability', 'market_investment', 'acquisition_activity',
+        'funding_rounds', 'investor_relations'
+    ],
+    'technology_advantage': [
+        'core_technologies', 'technical_differentiators', 'ip_portfolio', 'technical_partnerships',
+        'research_facilities', 'technology_roadmap'
+    ],
+    'competitive_moat': [
+        'brand_strength', 'customer_loyalty', 'network_effects', 'switching_costs',
+        'scale_advantages', 'regulatory_barriers'
+    ],
+    'strategic_initiatives': [
+        'market_expansion', 'product_development', 'digital_transformation',
+        'sustainability_initiatives', 'strategic_acquisitions', 'geographic_expansion'
+    ],
+    'risk_factors': [
+        'market_risks', 'technology_risks', 'regulatory_risks', 'competitive_risks',
+        'operational_risks', 'financial_risks'
+    ],
+}
+
+# 分类规则：(维度, 子项, 关键词集合, 记录字段顺序)
+# 记录中 source 为URL，timestamp 为时间戳，其余字段为内容摘要（前200字符）
+ANALYSIS_RULES = [
+    ('product_innovation', 'new_product_launches', frozenset({'新品', 'launch', 'new product', '发布'}), ('source', 'content', 'timestamp')),
+    ('product_innovation', 'technology_advancements', frozenset({'技术', 'technology', 'innovation', '创新'}), ('source', 'description', 'timestamp')),
+    ('product_innovation', 'patent_activity', frozenset({'patent', '专利', '知识产权'}), ('source', 'details', 'timestamp')),
+    ('product_innovation', 'rd_investment', frozenset({'研发', 'rd', 'research', 'investment'}), ('source', 'information', 'timestamp')),
+    ('market_positioning', 'target_segments', frozenset({'高端', 'premium', 'luxury', 'commercial', 'residential'}), ('segment', 'source', 'timestamp')),
+    ('market_positioning', 'pricing_strategy', frozenset({'价格', 'price', 'cost', '定价'}), ('strategy', 'source', 'timestamp')),
+    ('market_positioning', 'competitive_positioning', frozenset({'positioning', '定位', 'market'}), ('position', 'source', 'timestamp')),
+    ('channel_strategy', 'distribution_network', frozenset({'分销', 'distribution', 'channel'}), ('details', 'source', 'timestamp')),
+    ('channel_strategy', 'strategic_partnerships', frozenset({'合作', 'partnership', 'alliance', '伙伴'}), ('partner', 'source', 'timestamp')),
+    ('channel_strategy', 'dealer_network', frozenset({'dealer', '经销商', '代理'}), ('network', 'source', 'timestamp')),
+    ('financial_performance', 'revenue_data', frozenset({'revenue', '收入', 'sales', '营收'}), ('data', 'source', 'timestamp')),
+    ('financial_performance', 'profitability', frozenset({'profit', '利润', 'margin', '毛利率'}), ('metrics', 'source', 'timestamp')),
+    ('financial_performance', 'market_investment', frozenset({'investment', '投资', 'expansion'}), ('investment', 'source', 'timestamp')),
+    ('technology_advantage', 'core_technologies', frozenset({'核心技术', 'core technology', 'platform'}), ('technology', 'source', 'timestamp')),
+    ('technology_advantage', 'technical_differentiators', frozenset({'differentiation', '差异化', 'advantage'}), ('differentiator', 'source', 'timestamp')),
+    ('technology_advantage', 'ip_portfolio', frozenset({'ip', 'intellectual property', '知识产权'}), ('portfolio', 'source', 'timestamp')),
+    ('competitive_moat', 'brand_strength', frozenset({'brand', '品牌', 'reputation'}), ('strength', 'source', 'timestamp')),
+    ('competitive_moat', 'customer_loyalty', frozenset({'loyalty', '忠诚', 'customer'}), ('loyalty', 'source', 'timestamp')),
+    ('strategic_initiatives', 'market_expansion', frozenset({'expansion', '扩张', 'growth'}), ('initiative', 'source', 'timestamp')),
+    ('strategic_initiatives', 'digital_transformation', frozenset({'digital', '数字化', 'transformation'}), ('initiative', 'source', 'timestamp')),
+    ('strategic_initiatives', 'sustainability_initiatives', frozenset({'sustainability', '可持续', 'green'}), ('initiative', 'source', 'timestamp')),
+    ('risk_factors', 'market_risks', frozenset({'risk', '风险', 'challenge'}), ('risk', 'source', 'timestamp')),
+    ('risk_factors', 'regulatory_risks', frozenset({'regulatory', '监管', 'compliance'}), ('risk', 'source', 'timestamp')),
+]
+
+# BOSCH品牌识别关键词（匹配小写后的内容与URL）
+BOSCH_KEYWORDS = frozenset({
+    'bosch', '博世', 'bosch hvac', 'bosch heating',
+    'bosch climate', 'bosch thermotechnology'
+})
+
+# 实际需要扫描的关键词：包含其他关键词的短语（如 'bosch hvac'）必然已被较短关键词命中
+_BOSCH_SCAN_KEYWORDS = tuple(sorted(
+    keyword for keyword in BOSCH_KEYWORDS
+    if not any(other != keyword and other in keyword for other in BOSCH_KEYWORDS)
+))
+
+# 摘要中各维度展示的计数：(摘要字段名, 子项)
+SUMMARY_FIELDS = {
+    'product_innovation': (('new_products', 'new_product_launches'),
+                           ('tech_advancements', 'technology_advancements'),
+                           ('patents', 'patent_activity')),
+    'market_positioning': (('segments', 'target_segments'),
+                           ('positioning', 'competitive_positioning')),
+    'channel_strategy': (('partnerships', 'strategic_partnerships'),
+                         ('distribution', 'distribution_network')),
+    'financial_performance': (('revenue_data', 'revenue_data'),
+                              ('investments', 'market_investment')),
+    'technology_advantage': (('core_tech', 'core_technologies'),
+                             ('differentiators', 'technical_differentiators')),
+    'competitive_moat': (('brand_strength', 'brand_strength'),
+                         ('loyalty', 'customer_loyalty')),
+    'strategic_initiatives': (('expansion', 'market_expansion'),
+                              ('digital', 'digital_transformation')),
+    'risk_factors': (('market_risks', 'market_risks'),
+                     ('regulatory_risks', 'regulatory_risks')),
+}
+
+# 保存完整内容（不截断）的记录字段
+FULL_TEXT_FIELDS = {'segment'}
+
+# 每个维度对应的规则编号
+_DIMENSION_RULES = {dimension: [] for dimension in DIMENSION_BUCKETS}
+for _rule_id, _rule in enumerate(ANALYSIS_RULES):
+    _DIMENSION_RULES[_rule[0]].append(_rule_id)
+
+# 关键词 -> 命中的规则编号（同一关键词可能属于多条规则，只需扫描一次）
+_KEYWORD_RULES: Dict[str, tuple] = {}
+for _rule_id, _rule in enumerate(ANALYSIS_RULES):
+    for _keyword in sorted(_rule[2]):
+        _KEYWORD_RULES[_keyword] = _KEYWORD_RULES.get(_keyword, ()) + (_rule_id,)
+
+def _build_automaton():
+    """把所有关键词编译进一个Aho-Corasick自动机，值为命中的规则编号"""
+    automaton = ahocorasick.Automaton()
+    for keyword, rule_ids in _KEYWORD_RULES.items():
+        automaton.add_word(keyword, rule_ids)
+    automaton.make_automaton()
+    return automaton
+
+def _build_rule_set():
+    """把每条规则的关键词编译为一个RE2正则，整组规则在一次线性扫描中完成匹配"""
+    rule_set = re2.Set.SearchSet(re2.Options())
+    for _, _, keywords, _ in ANALYSIS_RULES:
+        rule_set.Add('|'.join(re2.escape(keyword) for keyword in sorted(keywords)))
+    rule_set.Compile()
+    return rule_set
+
+# 优先使用RE2规则集，其次Aho-Corasick自动机，都不可用时逐个关键词扫描
+_RULE_SET = _build_rule_set() if re2 is not None else None
+_AUTOMATON = _build_automaton() if _RULE_SET is None and ahocorasick is not None else None
+
+def _scan_rules(content: str) -> frozenset:
+    """用RE2规则集或Aho-Corasick自动机扫描单条小写内容，返回命中的规则编号集合"""
+    if _RULE_SET is not None:
+        # RE2规则集的编号即规则编号，无命中时返回None
+        return frozenset(_RULE_SET.Match(content) or ())
+    tags = set()
+    for _, rule_ids in _AUTOMATON.iter(content):
+        tags.update(rule_ids)
+    return frozenset(tags)
+
+def _content_key(text: str) -> int:
+    """计算文本的稳定64位哈希（有符号，可直接作为SQLite INTEGER主键），作为跨进程的缓存键"""
+    data = text.encode('utf-8')
+    if xxhash is not None:
+        return int.from_bytes(xxhash.xxh64_digest(data), 'little', signed=True)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little', signed=True)
+
+# 分类结果内存缓存：内容哈希 -> 规则编号集合 / 是否BOSCH相关
+CACHE_MAX_ENTRIES = 100_000
+_TAG_CACHE: Dict[int, frozenset] = {}
+_BOSCH_CACHE: Dict[int, bool] = {}
+
+# SQLite持久化缓存：路径 -> 连接，以及各路径本次运行新算出、尚未写盘的规则编号
+_CACHE_CONNECTIONS: Dict[str, sqlite3.Connection] = {}
+_PENDING_TAGS: Dict[str, Dict[int, frozenset]] = {}
+_SQLITE_MAX_PARAMS = 500
+
+# 规则指纹：关键词或规则变化时使已持久化的缓存失效
+_RULES_FINGERPRINT = _content_key(repr((
+    [(dimension, bucket, sorted(keywords), record_keys)
+     for dimension, bucket, keywords, record_keys in ANALYSIS_RULES],
+    sorted(BOSCH_KEYWORDS))))
+
+# 全部关键词的首字符：内容中一个都不出现时不可能命中任何规则
+_KEYWORD_FIRST_CHARS = frozenset(keyword[0] for keyword in _KEYWORD_RULES)
+
+def _scan_corpus(contents: List[str]) -> List[frozenset]:
+    """纯Python批量扫描：拼接全部内容，每个关键词只在整个语料上调用str.find"""
+    tags = [set() for _ in contents]
+
+    # 快速排除：不含任何关键词首字符的内容不参与拼接扫描（isdisjoint在首个交集字符处即返回）
+    candidates = [index for index, content in enumerate(contents)
+                  if not _KEYWORD_FIRST_CHARS.isdisjoint(content)]
+
+    starts = []
+    offset = 0
+    for index in candidates:
+        starts.append(offset)
+        offset += len(contents[index]) + 1
+
+    # 关键词不含分隔符，命中不会跨越两个数据点
+    find = '\0'.join([contents[index] for index in candidates]).find
+    count = len(candidates)
+    for keyword, rule_ids in _KEYWORD_RULES.items():
+        pos = find(keyword)
+        while pos != -1:
+            slot = bisect_right(starts, pos) - 1
+            tags[candidates[slot]].update(rule_ids)
+            if slot + 1 == count:
+                break
+            # 同一数据点命中一次即可，直接跳到下一个数据点继续查找
+            pos = find(keyword, starts[slot + 1])
+    return [frozenset(item_tags) for item_tags in tags]
+
+# 纯Python扫描的数据点超过该数量且有多个CPU时，分块交给进程池并行扫描
+PARALLEL_SCAN_THRESHOLD = 50_000
+
+def _scan_corpus_parallel(contents: List[str]) -> List[frozenset]:
+    """按CPU数把内容分块，用进程池并行执行 _scan_corpus，结果按原顺序拼接"""
+    workers = os.cpu_count() or 1
+    if workers < 2 or len(contents) < PARALLEL_SCAN_THRESHOLD:
+        return _scan_corpus(contents)
+
+    size = -(-len(contents) // workers)
+    chunks = [contents[start:start + size] for start in range(0, len(contents), size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [tags for part in executor.map(_scan_corpus, chunks) for tags in part]
+
+def _match_corpus(contents: List[str], cache_path: Optional[str] = None) -> List[frozenset]:
+    """批量返回每条小写内容命中的规则编号集合；依次查内存和SQLite缓存，只扫描都未命中的内容"""
+    keys = [_content_key(content) for content in contents]
+    fetched = _fetch_cached_tags(cache_path, keys)
+    tags = [_TAG_CACHE.get(key, fetched.get(key)) for key in keys]
+    missing = [index for index, item_tags in enumerate(tags) if item_tags is None]
+    if missing:
+        if _RULE_SET is not None or _AUTOMATON is not None:
+            scanned = [_scan_rules(contents[index]) for index in missing]
+        else:
+            scanned = _scan_corpus_parallel([contents[index] for index in missing])
+        pending = _PENDING_TAGS.setdefault(cache_path, {}) if cache_path else None
+        for index, item_tags in zip(missing, scanned):
+            tags[index] = item_tags
+            if pending is not None:
+                pending[keys[index]] = item_tags
+            if len(_TAG_CACHE) < CACHE_MAX_ENTRIES:
+                _TAG_CACHE[keys[index]] = item_tags
+    return tags
+
+def _is_bosch_text(content: str, url: str) -> bool:
+    """判断小写内容或URL中是否出现BOSCH关键词（按内容哈希在内存中缓存）"""
+    key = _content_key(content + '\0' + url)
+    verdict = _BOSCH_CACHE.get(key)
+    if verdict is None:
+        verdict = any(keyword in content or keyword in url for keyword in _BOSCH_SCAN_KEYWORDS)
+        if len(_BOSCH_CACHE) < CACHE_MAX_ENTRIES:
+            _BOSCH_CACHE[key] = verdict
+    return verdict
+
+def _is_bosch_item(item: Dict, content: Optional[str] = None, url: Optional[str] = None) -> bool:
+    """判断数据点是否与BOSCH相关：品牌字段为BOSCH，或内容/URL中出现BOSCH关键词"""
+    if item.get('brand') == 'BOSCH':
+        return True
+    if content is None:
+        content = item.get('content', '').lower()
+    if url is None:
+        url = item.get('url', '')
+    return _is_bosch_text(content, url.lower())
+
+def load_classification_cache(path: Optional[str], create: bool = True) -> Optional[sqlite3.Connection]:
+    """打开SQLite分类缓存；规则指纹变化时清空旧结果，打开失败时返回None
+
+    create 为False时缓存文件不存在则直接返回None，只读取缓存不会在当前目录生成数据库文件。
+    """
+    if not path:
+        return None
+    conn = _CACHE_CONNECTIONS.get(path)
+    if conn is not None:
+        return conn
+    if not create and not os.path.exists(path):
+        return None
+    try:
+        conn = sqlite3.connect(path)
+        conn.execute('PRAGMA journal_mode=WAL')
+        with conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)')
+            conn.execute('CREATE TABLE IF NOT EXISTS cache (hash INTEGER PRIMARY KEY, tags BLOB)')
+            row = conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+            if row is None or row[0] != _RULES_FINGERPRINT:
+                conn.execute('DELETE FROM cache')
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (_RULES_FINGERPRINT,))
+    except sqlite3.Error as e:
+        logger.warning(f"分类缓存打开失败，将重新计算: {e}")
+        return None
+    _CACHE_CONNECTIONS[path] = conn
+    return conn
+
+def _fetch_cached_tags(path: Optional[str], keys: List[int]) -> Dict[int, frozenset]:
+    """从SQLite缓存批量读取内存中还没有的内容哈希；内存缓存已满时读取结果只在本次返回"""
+    fetched: Dict[int, frozenset] = {}
+    wanted = [key for key in set(keys) if key not in _TAG_CACHE]
+    conn = load_classification_cache(path, create=False) if wanted else None
+    if conn is None:
+        return fetched
+    try:
+        for start in range(0, len(wanted), _SQLITE_MAX_PARAMS):
+            chunk = wanted[start:start + _SQLITE_MAX_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            for key, blob in conn.execute(f'SELECT hash, tags FROM cache WHERE hash IN ({placeholders})', chunk):
+                # 规则编号小于256，按字节存储
+                fetched[key] = tags = frozenset(blob)
+                if len(_TAG_CACHE) < CACHE_MAX_ENTRIES:
+                    _TAG_CACHE[key] = tags
+    except sqlite3.Error as e:
+        logger.warning(f"分类缓存读取失败，将重新计算: {e}")
+    return fetched
+
+def save_classification_cache(path: Optional[str]):
+    """把该路径本次运行新算出的分类结果批量写入SQLite缓存，供下次运行复用"""
+    pending = _PENDING_TAGS.get(path) if path else None
+    if not pending:
+        return
+    conn = load_classification_cache(path)
+    if conn is None:
+        return
+    try:
+        with conn:
+            conn.executemany('INSERT OR REPLACE INTO cache (hash, tags) VALUES (?, ?)',
+                             [(key, bytes(sorted(tags))) for key, tags in pending.items()])
+        del _PENDING_TAGS[path]
+    except (sqlite3.Error, ValueError) as e:
+        logger.warning(f"分类缓存保存失败: {e}")
+
+def close_classification_caches():
+    """关闭所有已打开的SQLite分类缓存连接（进程退出时自动调用）；未保存的分类结果不会写盘"""
+    while _CACHE_CONNECTIONS:
+        _, conn = _CACHE_CONNECTIONS.popitem()
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"分类缓存关闭失败: {e}")
+
+atexit.register(close_classification_caches)
+
+# 记录字段对应的取值：source/timestamp 取自数据点，其余为摘要或完整内容
+_FIELD_SOURCES = {'source': 'url', 'timestamp': 'timestamp'}
+
+def _compile_record_factory(record_keys):
+    """根据规则的记录字段顺序生成专用构造函数，直接返回字典字面量"""
+    fields = ', '.join(
+        f"{key!r}: {_FIELD_SOURCES.get(key, 'content' if key in FULL_TEXT_FIELDS else 'snippet')}"
+        for key in record_keys
+    )
+    return eval(f"lambda content, snippet, url, timestamp: {{{fields}}}")
+
+# 规则编号 -> (维度, 子项, 记录构造函数)，导入时按规则表一次生成
+_RULE_TARGETS = [
+    (dimension, bucket, _compile_record_factory(record_keys))
+    for dimension, bucket, _, record_keys in ANALYSIS_RULES
+]
+
+def _build_records(item: Dict, lowered: str, url: str, tags: frozenset) -> Dict[tuple, Dict[str, Any]]:
+    """根据命中的规则编号为单个数据点生成 (维度, 子项) -> 分析记录"""
+    records = {}
+    if not tags:
+        return records
+
+    # 每个数据点只截取一次摘要，所有子项记录引用同一字符串
+    timestamp = item.get('timestamp')
+    snippet = lowered[:200] + '...'
+    for rule_id in tags:
+        dimension, bucket, make_record = _RULE_TARGETS[rule_id]
+        records[(dimension, bucket)] = make_record(lowered, snippet, url, timestamp)
+    return records
+
+def _empty_dimensions() -> Dict[str, Dict[str, list]]:
+    """构建全部分析维度的空结果"""
+    return {dimension: {bucket: [] for bucket in buckets}
+            for dimension, buckets in DIMENSION_BUCKETS.items()}
+
+# (维度, 子项) -> 记录构造函数
+_BUCKET_FACTORIES = {(dimension, bucket): make_record for dimension, bucket, make_record in _RULE_TARGETS}
+
 @dataclass
 class BoschAnalysisFocus:
     """BOSCH分析重点"""
@@ -24,389 +418,149 @@ class BoschAnalysisFocus:
     strategic_initiatives: Dict[str, Any]
     risk_factors: Dict[str, Any]
 
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """转换为字典；各维度已是纯字典，直接引用而不做 asdict 的深拷贝"""
+        return {dimension: getattr(self, dimension) for dimension in DIMENSION_BUCKETS}
+
 class BoschDeepAnalyzer:
-    def __init__(self, data_points: List[Dict] = None):
+    def __init__(self, data_points: List[Dict] = None, cache_path: Optional[str] = ".analyzer_cache.db"):
         self.data_points = data_points or []
-        self.bosch_data = self.filter_bosch_data()
+        self.cache_path = cache_path
+        # (数据点, 小写内容, URL)，筛选时算好的小写内容在分类阶段直接复用
+        self._enriched = self._filter_enriched()
+        self.bosch_data = [item for item, _, _ in self._enriched]
         self.analysis_result = None
+        # 分类结果按列存储：各子项只记录命中数据点的位置，访问维度时再物化为记录字典
+        self._hits = None
+        self._snippets = None
+        self._counts = None
+        self._dimensions = {}
+
+    @classmethod
+    def from_file(cls, filepath: str, cache_path: Optional[str] = ".analyzer_cache.db") -> 'BoschDeepAnalyzer':
+        """从JSON数组文件加载数据点（安装了orjson时使用orjson解析）"""
+        with open(filepath, 'rb') as f:
+            data_points = orjson.loads(f.read()) if orjson is not None else json.load(f)
+        return cls(data_points, cache_path=cache_path)
+
+    @classmethod
+    def from_stream(cls, filepath: str, cache_path: Optional[str] = ".analyzer_cache.db") -> 'BoschDeepAnalyzer':
+        """用ijson逐条解析JSON数组，只保留BOSCH相关数据点，其余解析后即丢弃
+
+        未安装ijson时退回 from_file 一次性加载。流式加载时 data_points 只包含BOSCH相关数据点。
+        """
+        if ijson is None:
+            return cls.from_file(filepath, cache_path=cache_path)
+
+        with open(filepath, 'rb') as f:
+            data_points = [item for item in ijson.items(f, 'item', use_float=True) if _is_bosch_item(item)]
+        return cls(data_points, cache_path=cache_path)
 
     def filter_bosch_data(self) -> List[Dict]:
         """筛选BOSCH相关数据"""
-        bosch_data = []
+        return [item for item, _, _ in self._filter_enriched()]
 
-        for item in self.data_points:
-            # 检查品牌字段
-            if item.get('brand') == 'BOSCH':
-                bosch_data.append(item)
-                continue
+    def _filter_enriched(self) -> List[tuple]:
+        """筛选BOSCH相关数据，同时保留每个数据点的小写内容和URL"""
+        enriched = []
 
-            # 检查URL和内容中的BOSCH关键词
+        for item in self.data_points:
             content = item.get('content', '').lower()
-            url = item.get('url', '').lower()
-
-            bosch_keywords = [
-                'bosch', '博世', 'bosch hvac', 'bosch heating',
-                'bosch climate', 'bosch thermotechnology'
-            ]
+            url = item.get('url', '')
 
-            if any(keyword in content or keyword in url for keyword in bosch_keywords):
-                bosch_data.append(item)
+            # 检查品牌字段，再检查URL和内容中的BOSCH关键词
+            if _is_bosch_item(item, content, url):
+                enriched.append((item, content, url))
 
-        logger.info(f"筛选出 {len(bosch_data)} 个BOSCH相关数据点")
-        return bosch_data
+        logger.info(f"筛选出 {len(enriched)} 个BOSCH相关数据点")
+        return enriched
 
     def analyze_product_innovation(self) -> Dict[str, Any]:
         """分析产品创新和技术优势"""
         logger.info("分析BOSCH产品创新...")
-
-        innovation_analysis = {
-            'new_product_launches': [],
-            'technology_advancements': [],
-            'patent_activity': [],
-            'rd_investment': [],
-            'innovation_partnerships': [],
-            'market_firsts': [],
-            'product_line_expansion': []
-        }
-
-        # 分析数据点
-        for item in self.bosch_data:
-            content = item.get('content', '').lower()
-            url = item.get('url', '')
-
-            # 产品发布
-            if any(keyword in content for keyword in ['新品', 'launch', 'new product', '发布']):
-                innovation_analysis['new_product_launches'].append({
-                    'source': url,
-                    'content': content[:200] + '...',
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 技术进步
-            if any(keyword in content for keyword in ['技术', 'technology', 'innovation', '创新']):
-                innovation_analysis['technology_advancements'].append({
-                    'source': url,
-                    'description': content[:200] + '...',
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 专利活动
-            if any(keyword in content for keyword in ['patent', '专利', '知识产权']):
-                innovation_analysis['patent_activity'].append({
-                    'source': url,
-                    'details': content[:200] + '...',
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 研发投入
-            if any(keyword in content for keyword in ['研发', 'rd', 'research', 'investment']):
-                innovation_analysis['rd_investment'].append({
-                    'source': url,
-                    'information': content[:200] + '...',
-                    'timestamp': item.get('timestamp')
-                })
-
-        return innovation_analysis
+        return self._dimension('product_innovation')
 
     def analyze_market_positioning(self) -> Dict[str, Any]:
         """分析市场定位和价格策略"""
         logger.info("分析BOSCH市场定位...")
-
-        positioning_analysis = {
-            'target_segments': [],
-            'pricing_strategy': [],
-            'value_proposition': [],
-            'market_share_data': [],
-            'competitive_positioning': [],
-            'brand_perception': []
-        }
-
-        for item in self.bosch_data:
-            content = item.get('content', '').lower()
-            url = item.get('url', '')
-
-            # 目标细分市场
-            if any(keyword in content for keyword in ['高端', 'premium', 'luxury', 'commercial', 'residential']):
-                positioning_analysis['target_segments'].append({
-                    'segment': content,
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 定价策略
-            if any(keyword in content for keyword in ['价格', 'price', 'cost', '定价']):
-                positioning_analysis['pricing_strategy'].append({
-                    'strategy': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 市场定位
-            if any(keyword in content for keyword in ['positioning', '定位', 'market']):
-                positioning_analysis['competitive_positioning'].append({
-                    'position': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-        return positioning_analysis
+        return self._dimension('market_positioning')
 
     def analyze_channel_strategy(self) -> Dict[str, Any]:
         """分析渠道布局和合作伙伴"""
         logger.info("分析BOSCH渠道策略...")
-
-        channel_analysis = {
-            'distribution_network': [],
-            'strategic_partnerships': [],
-            'direct_sales': [],
-            'dealer_network': [],
-            'online_channels': [],
-            'service_network': []
-        }
-
-        for item in self.bosch_data:
-            content = item.get('content', '').lower()
-            url = item.get('url', '')
-
-            # 分销网络
-            if any(keyword in content for keyword in ['分销', 'distribution', 'channel']):
-                channel_analysis['distribution_network'].append({
-                    'details': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 战略合作
-            if any(keyword in content for keyword in ['合作', 'partnership', 'alliance', '伙伴']):
-                channel_analysis['strategic_partnerships'].append({
-                    'partner': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 经销商网络
-            if any(keyword in content for keyword in ['dealer', '经销商', '代理']):
-                channel_analysis['dealer_network'].append({
-                    'network': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-        return channel_analysis
+        return self._dimension('channel_strategy')
 
     def analyze_financial_performance(self) -> Dict[str, Any]:
         """分析财务表现和投资动态"""
         logger.info("分析BOSCH财务表现...")
-
-        financial_analysis = {
-            'revenue_data': [],
-            'profitability': [],
-            'market_investment': [],
-            'acquisition_activity': [],
-            'funding_rounds': [],
-            'investor_relations': []
-        }
-
-        for item in self.bosch_data:
-            content = item.get('content', '').lower()
-            url = item.get('url', '')
-
-            # 收入数据
-            if any(keyword in content for keyword in ['revenue', '收入', 'sales', '营收']):
-                financial_analysis['revenue_data'].append({
-                    'data': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 盈利能力
-            if any(keyword in content for keyword in ['profit', '利润', 'margin', '毛利率']):
-                financial_analysis['profitability'].append({
-                    'metrics': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 市场投资
-            if any(keyword in content for keyword in ['investment', '投资', 'expansion']):
-                financial_analysis['market_investment'].append({
-                    'investment': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-        return financial_analysis
+        return self._dimension('financial_performance')
 
     def analyze_technology_advantage(self) -> Dict[str, Any]:
         """分析技术优势和竞争力护城河"""
         logger.info("分析BOSCH技术优势...")
-
-        tech_analysis = {
-            'core_technologies': [],
-            'technical_differentiators': [],
-            'ip_portfolio': [],
-            'technical_partnerships': [],
-            'research_facilities': [],
-            'technology_roadmap': []
-        }
-
-        for item in self.bosch_data:
-            content = item.get('content', '').lower()
-            url = item.get('url', '')
-
-            # 核心技术
-            if any(keyword in content for keyword in ['核心技术', 'core technology', 'platform']):
-                tech_analysis['core_technologies'].append({
-                    'technology': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 技术差异化
-            if any(keyword in content for keyword in ['differentiation', '差异化', 'advantage']):
-                tech_analysis['technical_differentiators'].append({
-                    'differentiator': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 知识产权组合
-            if any(keyword in content for keyword in ['ip', 'intellectual property', '知识产权']):
-                tech_analysis['ip_portfolio'].append({
-                    'portfolio': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-        return tech_analysis
+        return self._dimension('technology_advantage')
 
     def analyze_competitive_moat(self) -> Dict[str, Any]:
         """分析竞争护城河"""
         logger.info("分析BOSCH竞争护城河...")
-
-        moat_analysis = {
-            'brand_strength': [],
-            'customer_loyalty': [],
-            'network_effects': [],
-            'switching_costs': [],
-            'scale_advantages': [],
-            'regulatory_barriers': []
-        }
-
-        for item in self.bosch_data:
-            content = item.get('content', '').lower()
-            url = item.get('url', '')
-
-            # 品牌实力
-            if any(keyword in content for keyword in ['brand', '品牌', 'reputation']):
-                moat_analysis['brand_strength'].append({
-                    'strength': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 客户忠诚度
-            if any(keyword in content for keyword in ['loyalty', '忠诚', 'customer']):
-                moat_analysis['customer_loyalty'].append({
-                    'loyalty': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-        return moat_analysis
+        return self._dimension('competitive_moat')
 
     def analyze_strategic_initiatives(self) -> Dict[str, Any]:
         """分析战略举措"""
         logger.info("分析BOSCH战略举措...")
-
-        strategic_analysis = {
-            'market_expansion': [],
-            'product_development': [],
-            'digital_transformation': [],
-            'sustainability_initiatives': [],
-            'strategic_acquisitions': [],
-            'geographic_expansion': []
-        }
-
-        for item in self.bosch_data:
-            content = item.get('content', '').lower()
-            url = item.get('url', '')
-
-            # 市场扩张
-            if any(keyword in content for keyword in ['expansion', '扩张', 'growth']):
-                strategic_analysis['market_expansion'].append({
-                    'initiative': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 数字化转型
-            if any(keyword in content for keyword in ['digital', '数字化', 'transformation']):
-                strategic_analysis['digital_transformation'].append({
-                    'initiative': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 可持续发展
-            if any(keyword in content for keyword in ['sustainability', '可持续', 'green']):
-                strategic_analysis['sustainability_initiatives'].append({
-                    'initiative': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-        return strategic_analysis
+        return self._dimension('strategic_initiatives')
 
     def analyze_risk_factors(self) -> Dict[str, Any]:
         """分析风险因素"""
         logger.info("分析BOSCH风险因素...")
-
-        risk_analysis = {
-            'market_risks': [],
-            'technology_risks': [],
-            'regulatory_risks': [],
-            'competitive_risks': [],
-            'operational_risks': [],
-            'financial_risks': []
-        }
-
-        for item in self.bosch_data:
-            content = item.get('content', '').lower()
-            url = item.get('url', '')
-
-            # 市场风险
-            if any(keyword in content for keyword in ['risk', '风险', 'challenge']):
-                risk_analysis['market_risks'].append({
-                    'risk': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-            # 监管风险
-            if any(keyword in content for keyword in ['regulatory', '监管', 'compliance']):
-                risk_analysis['regulatory_risks'].append({
-                    'risk': content[:200] + '...',
-                    'source': url,
-                    'timestamp': item.get('timestamp')
-                })
-
-        return risk_analysis
+        return self._dimension('risk_factors')
+
+    def _classify_all(self) -> Dict[str, Dict[str, List[int]]]:
+        """一次遍历BOSCH数据点完成全部八个维度的分类，只记录命中数据点的位置"""
+        if self._hits is None:
+            hits = {dimension: {bucket: [] for bucket in buckets}
+                    for dimension, buckets in DIMENSION_BUCKETS.items()}
+            contents = [lowered for _, lowered, _ in self._enriched]
+            snippets = [None] * len(contents)
+            for position, tags in enumerate(_match_corpus(contents, self.cache_path)):
+                if not tags:
+                    continue
+                # 每个数据点只截取一次摘要，所有子项记录引用同一字符串
+                snippets[position] = contents[position][:200] + '...'
+                for rule_id in tags:
+                    dimension, bucket, _ = _RULE_TARGETS[rule_id]
+                    hits[dimension][bucket].append(position)
+            self._hits = hits
+            self._snippets = snippets
+            self._counts = {dimension: {bucket: len(positions) for bucket, positions in buckets.items()}
+                            for dimension, buckets in hits.items()}
+        return self._hits
+
+    def _dimension(self, dimension: str) -> Dict[str, Any]:
+        """把单个维度的命中位置物化为记录字典列表（每个维度只物化一次）"""
+        result = self._dimensions.get(dimension)
+        if result is None:
+            hits = self._classify_all()[dimension]
+            enriched = self._enriched
+            snippets = self._snippets
+            result = {}
+            for bucket, positions in hits.items():
+                make_record = _BUCKET_FACTORIES.get((dimension, bucket))
+                records = []
+                for position in positions:
+                    item, lowered, url = enriched[position]
+                    records.append(make_record(lowered, snippets[position], url, item.get('timestamp')))
+                result[bucket] = records
+            self._dimensions[dimension] = result
+        return result
 
     def run_deep_analysis(self) -> BoschAnalysisFocus:
         """运行完整的BOSCH深度分析"""
         logger.info("开始BOSCH深度分析...")
 
-        analysis = BoschAnalysisFocus(
-            product_innovation=self.analyze_product_innovation(),
-            market_positioning=self.analyze_market_positioning(),
-            channel_strategy=self.analyze_channel_strategy(),
-            financial_performance=self.analyze_financial_performance(),
-            technology_advantage=self.analyze_technology_advantage(),
-            competitive_moat=self.analyze_competitive_moat(),
-            strategic_initiatives=self.analyze_strategic_initiatives(),
-            risk_factors=self.analyze_risk_factors()
-        )
+        # 单次遍历完成分类，各 analyze_* 方法只是读取（并按需物化）结果
+        analysis = BoschAnalysisFocus(**{dimension: self._dimension(dimension)
+                                           for dimension in DIMENSION_BUCKETS})
 
         self.analysis_result = analysis
         logger.info("BOSCH深度分析完成")
@@ -419,10 +573,16 @@ class BoschDeepAnalyzer:
             logger.warning("未找到分析结果，无法保存")
             return
 
-        result_dict = asdict(self.analysis_result)
+        result_dict = self.analysis_result.to_dict()
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(result_dict, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(result_dict, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(result_dict, f, indent=2, ensure_ascii=False)
+
+        save_classification_cache(self.cache_path)
 
         logger.info(f"BOSCH深度分析结果已保存到: {filepath}")
 
@@ -431,47 +591,71 @@ class BoschDeepAnalyzer:
         if not self.analysis_result:
             return {}
 
-        analysis = self.analysis_result
-
+        self._classify_all()
+        counts = self._counts
         return {
             'total_data_points': len(self.bosch_data),
             'analysis_dimensions': {
-                'product_innovation': {
-                    'new_products': len(analysis.product_innovation['new_product_launches']),
-                    'tech_advancements': len(analysis.product_innovation['technology_advancements']),
-                    'patents': len(analysis.product_innovation['patent_activity'])
-                },
-                'market_positioning': {
-                    'segments': len(analysis.market_positioning['target_segments']),
-                    'positioning': len(analysis.market_positioning['competitive_positioning'])
-                },
-                'channel_strategy': {
-                    'partnerships': len(analysis.channel_strategy['strategic_partnerships']),
-                    'distribution': len(analysis.channel_strategy['distribution_network'])
-                },
-                'financial_performance': {
-                    'revenue_data': len(analysis.financial_performance['revenue_data']),
-                    'investments': len(analysis.financial_performance['market_investment'])
-                },
-                'technology_advantage': {
-                    'core_tech': len(analysis.technology_advantage['core_technologies']),
-                    'differentiators': len(analysis.technology_advantage['technical_differentiators'])
-                },
-                'competitive_moat': {
-                    'brand_strength': len(analysis.competitive_moat['brand_strength']),
-                    'loyalty': len(analysis.competitive_moat['customer_loyalty'])
-                },
-                'strategic_initiatives': {
-                    'expansion': len(analysis.strategic_initiatives['market_expansion']),
-                    'digital': len(analysis.strategic_initiatives['digital_transformation'])
-                },
-                'risk_factors': {
-                    'market_risks': len(analysis.risk_factors['market_risks']),
-                    'regulatory_risks': len(analysis.risk_factors['regulatory_risks'])
-                }
+                dimension: {label: counts[dimension][bucket] for label, bucket in fields}
+                for dimension, fields in SUMMARY_FIELDS.items()
             }
         }
 
+def brand_keywords(brand: str) -> frozenset:
+    """品牌识别关键词：BOSCH使用专门的关键词表，其他品牌使用小写品牌名（如 Goodman/Daikin 拆为两个）"""
+    if brand == 'BOSCH':
+        return BOSCH_KEYWORDS
+    return frozenset(part.strip().lower() for part in brand.split('/') if part.strip())
+
+class MultiBrandAnalyzer:
+    """多品牌分析：一次关键词扫描同时为多个品牌构建与BOSCH深度分析相同结构的结果"""
+
+    def __init__(self, data_points: List[Dict] = None, brands: List[str] = None,
+                 cache_path: Optional[str] = None):
+        self.data_points = data_points or []
+        self.brands = list(brands or ['BOSCH'])
+        self.cache_path = cache_path
+        self._brand_keywords = {brand: brand_keywords(brand) for brand in self.brands}
+        self.brand_data = {brand: [] for brand in self.brands}
+        self.results: Dict[str, BoschAnalysisFocus] = {}
+
+        # (数据点, 小写内容, URL, 命中的品牌列表)，只保留至少属于一个品牌的数据点
+        self._enriched = []
+        for item in self.data_points:
+            content = item.get('content', '').lower()
+            url = item.get('url', '')
+            matched = [brand for brand in self.brands if self._matches_brand(brand, item, content, url)]
+            if matched:
+                self._enriched.append((item, content, url, matched))
+                for brand in matched:
+                    self.brand_data[brand].append(item)
+
+    def _matches_brand(self, brand: str, item: Dict, content: str, url: str) -> bool:
+        """判断数据点是否属于指定品牌，BOSCH与 BoschDeepAnalyzer 的筛选规则一致"""
+        if brand == 'BOSCH':
+            return _is_bosch_item(item, content, url)
+        if item.get('brand') == brand:
+            return True
+        url = url.lower()
+        return any(keyword in content or keyword in url for keyword in self._brand_keywords[brand])
+
+    def run_analysis(self) -> Dict[str, BoschAnalysisFocus]:
+        """对所有品牌的数据点只做一次分类，再按品牌分发分析记录"""
+        logger.info(f"开始多品牌分析: {', '.join(self.brands)}")
+        dimensions = {brand: _empty_dimensions() for brand in self.brands}
+
+        contents = [lowered for _, lowered, _, _ in self._enriched]
+        for (item, lowered, url, matched), tags in zip(self._enriched, _match_corpus(contents, self.cache_path)):
+            for (dimension, bucket), record in _build_records(item, lowered, url, tags).items():
+                for brand in matched:
+                    dimensions[brand][dimension][bucket].append(record)
+
+        self.results = {brand: BoschAnalysisFocus(**dimensions[brand]) for brand in self.brands}
+        # 指定了缓存路径时，把本次新算出的分类结果写入持久化缓存
+        save_classification_cache(self.cache_path)
+        logger.info("多品牌分析完成")
+        return self.results
+
 def main():
     """主函数 - BOSCH深度分析测试"""
     print("BOSCH深度分析器")
@@ -4,19 +4,158 @@ HVAC首席商业分析师 - 数据收集引擎
 支持Firecrawl和网络搜索双模式数据收集
 """
 
+import copy
 import json
 import asyncio
+import hashlib
+import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass
 import logging
 import re
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from collections import Counter
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from backpressure import AdaptiveConcurrency
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+# 抓取/搜索的初始并发数，之后由AIMD控制器按延迟和限流情况自动调整
+FETCH_CONCURRENCY = 50
+
+# 搜索结果按查询缓存：有效期（秒）与最多缓存的查询数（LRU淘汰）
+SEARCH_CACHE_TTL = 3600
+SEARCH_CACHE_MAX_ENTRIES = 512
+
+def _compile_alternation(words) -> 're.Pattern':
+    """把字面关键词编译为单个多选分支正则
+
+    安装 google-re2 时使用RE2（线性时间、无回溯）；RE2无法编译时退回标准库re。
+    """
+    if re2 is not None:
+        try:
+            return re2.compile('|'.join(re2.escape(word) for word in words))
+        except re2.error:
+            pass
+    return re.compile('|'.join(re.escape(word) for word in words))
+
+# 品牌识别模式（小写） -> 品牌名；多个品牌同时出现时按此顺序取第一个。
+# 查询中的 "xx hvac"、"xx heating" 均包含品牌名本身，因此URL与查询共用同一张表
+BRAND_PATTERNS = {
+    'carrier': 'Carrier',
+    'trane': 'Trane',
+    'bosch': 'BOSCH',
+    'lennox': 'Lennox',
+    'goodman': 'Goodman',
+    'daikin': 'Daikin'
+}
+
+_BRAND_RE = _compile_alternation(BRAND_PATTERNS)
+_BRAND_PRIORITY = {pattern: index for index, pattern in enumerate(BRAND_PATTERNS)}
+
+def _match_brand(text_lower: str) -> Optional[str]:
+    """在已转小写的文本中单次正则扫描识别品牌"""
+    matches = _BRAND_RE.findall(text_lower)
+    if not matches:
+        return None
+    return BRAND_PATTERNS[min(matches, key=_BRAND_PRIORITY.__getitem__)]
+
+# 敏感信息关键词（小写）
+SENSITIVE_KEYWORDS = ('unreleased', 'confidential', 'internal', '未发布', '机密')
+
+def _build_sensitive_automaton():
+    """构建敏感关键词的Aho-Corasick自动机，单次线性扫描匹配全部关键词"""
+    automaton = ahocorasick.Automaton()
+    for keyword in SENSITIVE_KEYWORDS:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+# 优先使用RE2多选分支；未安装 google-re2 时使用Aho-Corasick自动机，两者都没有时退回标准库re
+_SENSITIVE_RE = _compile_alternation(SENSITIVE_KEYWORDS)
+_SENSITIVE_AUTOMATON = (_build_sensitive_automaton()
+                        if re2 is None and ahocorasick is not None else None)
+
+def _contains_sensitive(text_lower: str) -> bool:
+    """已转小写的文本是否包含任一敏感关键词"""
+    if _SENSITIVE_AUTOMATON is not None:
+        return next(_SENSITIVE_AUTOMATON.iter(text_lower), None) is not None
+    return _SENSITIVE_RE.search(text_lower) is not None
+
+def _compile_keywords(keywords: Optional[List[str]]) -> Optional['re.Pattern']:
+    """将关键词列表编译为匹配小写文本的单个正则；无关键词时返回None"""
+    if not keywords:
+        return None
+    return _compile_alternation(keyword.lower() for keyword in keywords)
+
+# 去重键取内容的前若干字符
+DEDUP_PREFIX_CHARS = 100
+
+def _dedup_key(url: str, content: str) -> int:
+    """URL与内容前缀的64位哈希，作为去重集合中的整数键"""
+    data = (url + '\0' + content[:DEDUP_PREFIX_CHARS]).encode('utf-8', 'surrogatepass')
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+# Python 3.10+ 为数据点启用 __slots__，去掉每个实例的 __dict__；更早版本保持普通数据类
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@lru_cache(maxsize=16)
+def _parse_json_config(path: str, mtime_ns: int, size: int) -> Dict:
+    """解析JSON配置文件；以 (路径, 修改时间, 大小) 为键缓存，文件未变时不重复解析"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+# 合并的数据点超过该数量且有多个CPU时，去重键和敏感词检测分块交给进程池计算
+PARALLEL_FINALIZE_THRESHOLD = 50_000
+
+def _fingerprint_items(pairs: List[Tuple[str, str]]) -> List[Tuple[int, bool]]:
+    """计算每个 (url, content) 的去重键及内容是否含敏感词"""
+    return [
+        (_dedup_key(url, content), bool(content) and _contains_sensitive(content.lower()))
+        for url, content in pairs
+    ]
+
+def _fingerprint_items_parallel(pairs: List[Tuple[str, str]], workers: int) -> List[Tuple[int, bool]]:
+    """按CPU数分块，用进程池并行执行 _fingerprint_items，结果按原顺序拼接"""
+    size = -(-len(pairs) // workers)
+    shards = [pairs[start:start + size] for start in range(0, len(pairs), size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [result for part in executor.map(_fingerprint_items, shards) for result in part]
+
+@dataclass(**_DATACLASS_OPTIONS)
 class DataPoint:
     """数据点类"""
     source: str
@@ -29,19 +168,49 @@ class DataPoint:
     confidence: float = 1.0
     metadata: Optional[Dict] = None
 
+    def to_dict(self) -> Dict:
+        """转换为字典（浅拷贝，仅用于序列化，避免 asdict 的递归深拷贝）"""
+        return {
+            'source': self.source,
+            'url': self.url,
+            'content': self.content,
+            'data_type': self.data_type,
+            'timestamp': self.timestamp,
+            'brand': self.brand,
+            'sensitivity': self.sensitivity,
+            'confidence': self.confidence,
+            'metadata': self.metadata
+        }
+
+def _dump_item(item: Dict) -> bytes:
+    """将单条记录序列化为缩进2格的JSON（作为数组元素再整体缩进2格）"""
+    if orjson is not None:
+        data = orjson.dumps(item, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(item, indent=2, ensure_ascii=False).encode('utf-8')
+    return data.replace(b'\n', b'\n  ')
+
 class HVACDataCollector:
-    def __init__(self, config_path: str = "analysis_config.json"):
+    def __init__(self, config_path: str = "analysis_config.json",
+                 search_cache_size: int = SEARCH_CACHE_MAX_ENTRIES,
+                 search_cache_ttl: float = SEARCH_CACHE_TTL):
         self.config = self.load_analysis_config(config_path)
         self.data_source_manager = None
         self.collected_data: List[DataPoint] = []
+        self._limiter = AdaptiveConcurrency(initial=FETCH_CONCURRENCY)
+        # 查询 -> (写入时间, 原始搜索结果)；search_cache_size 为0时不缓存
+        self._search_cache: 'OrderedDict[str, Tuple[float, List[Dict]]]' = OrderedDict()
+        self.search_cache_size = search_cache_size
+        self.search_cache_ttl = search_cache_ttl
 
     def load_analysis_config(self, config_path: str) -> Dict:
         """加载分析配置"""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                logger.info(f"已加载分析配置: {config_path}")
-                return config
+            stat = os.stat(config_path)
+            config = _parse_json_config(config_path, stat.st_mtime_ns, stat.st_size)
+            logger.info(f"已加载分析配置: {config_path}")
+            # 返回副本，调用方修改配置不会污染缓存
+            return copy.deepcopy(config)
         except FileNotFoundError:
             logger.error(f"配置文件不存在: {config_path}")
             return {}
@@ -57,47 +226,73 @@ class HVACDataCollector:
 
     async def collect_from_firecrawl(self, urls: List[str],
                                    keywords: List[str] = None) -> List[DataPoint]:
-        """使用Firecrawl方式收集数据"""
+        """使用Firecrawl方式收集数据（各URL并发抓取，按URL顺序返回）"""
         logger.info(f"使用Firecrawl模式收集 {len(urls)} 个URL的数据")
 
-        # 这里模拟Firecrawl的实际调用
-        # 在实际使用中，会调用真实的Firecrawl API
+        # 关键词在所有URL间共用，只编译一次
+        keyword_re = _compile_keywords(keywords)
+        results = await asyncio.gather(
+            *(self._fetch_firecrawl(url, keyword_re) for url in urls),
+            return_exceptions=True
+        )
+
         data_points = []
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.error(f"收集 {url} 时出错: {str(result)}")
+            elif result is not None:
+                data_points.append(result)
 
-        for url in urls:
-            try:
-                # 模拟数据收集过程
-                mock_data = {
-                    'source': url,
-                    'content': f"从 {url} 收集的内容...",
-                    'timestamp': datetime.now().isoformat()
-                }
+        return data_points
 
-                # 检查是否包含关键词
-                if keywords and any(keyword.lower() in url.lower() for keyword in keywords):
-                    data_points.append(DataPoint(
-                        source=url,
-                        url=url,
-                        content=mock_data['content'],
-                        data_type='news',
-                        timestamp=mock_data['timestamp'],
-                        brand=self.extract_brand_from_url(url),
-                        metadata={'collection_method': 'firecrawl'}
-                    ))
-
-            except Exception as e:
-                logger.error(f"收集 {url} 时出错: {str(e)}")
+    async def _fetch_firecrawl(self, url: str,
+                               keyword_re: Optional['re.Pattern'] = None) -> Optional[DataPoint]:
+        """抓取单个URL，受自适应并发控制；不匹配关键词时返回None"""
+        async with self._limiter.slot():
+            # 这里模拟Firecrawl的实际调用
+            # 在实际使用中，会调用真实的Firecrawl API
+            mock_data = {
+                'source': url,
+                'content': f"从 {url} 收集的内容...",
+                'timestamp': datetime.now().isoformat()
+            }
 
-        return data_points
+        # 检查是否包含关键词
+        if keyword_re is not None and keyword_re.search(url.lower()):
+            return DataPoint(
+                source=url,
+                url=url,
+                content=mock_data['content'],
+                data_type='news',
+                timestamp=mock_data['timestamp'],
+                brand=self.extract_brand_from_url(url),
+                metadata={'collection_method': 'firecrawl'}
+            )
+        return None
 
     async def collect_from_web_search(self, queries: List[str]) -> List[DataPoint]:
-        """使用网络搜索方式收集数据"""
+        """使用网络搜索方式收集数据（各查询并发执行，按查询顺序返回）"""
         logger.info(f"使用网络搜索模式收集 {len(queries)} 个查询的数据")
 
+        results = await asyncio.gather(
+            *(self._search_one(query) for query in queries),
+            return_exceptions=True
+        )
+
         data_points = []
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                logger.error(f"搜索 {query} 时出错: {str(result)}")
+            else:
+                data_points.extend(result)
+
+        return data_points
 
-        for query in queries:
-            try:
+    async def _search_one(self, query: str) -> List[DataPoint]:
+        """执行单个搜索查询，受自适应并发控制；有效期内的重复查询直接使用缓存结果"""
+        mock_results = self._get_cached_search(query)
+        if mock_results is None:
+            async with self._limiter.slot():
                 # 模拟搜索过程
                 # 在实际使用中，会调用真实的搜索引擎API
                 mock_results = [
@@ -107,60 +302,54 @@ class HVACDataCollector:
                         'snippet': f"关于 {query} 的信息..."
                     }
                 ]
+            self._put_cached_search(query, mock_results)
 
-                for result in mock_results:
-                    data_points.append(DataPoint(
-                        source="web_search",
-                        url=result['url'],
-                        content=f"{result['title']}: {result['snippet']}",
-                        data_type='news',
-                        timestamp=datetime.now().isoformat(),
-                        brand=self.extract_brand_from_query(query),
-                        metadata={
-                            'collection_method': 'web_search',
-                            'query': query,
-                            'title': result['title']
-                        }
-                    ))
-
-            except Exception as e:
-                logger.error(f"搜索 {query} 时出错: {str(e)}")
-
+        # 每次都新建数据点，调用方修改数据点（如标记BOSCH）不会影响缓存
+        data_points = []
+        for result in mock_results:
+            data_points.append(DataPoint(
+                source="web_search",
+                url=result['url'],
+                content=f"{result['title']}: {result['snippet']}",
+                data_type='news',
+                timestamp=datetime.now().isoformat(),
+                brand=self.extract_brand_from_query(query),
+                metadata={
+                    'collection_method': 'web_search',
+                    'query': query,
+                    'title': result['title']
+                }
+            ))
         return data_points
 
+    def _get_cached_search(self, query: str) -> Optional[List[Dict]]:
+        """取未过期的缓存搜索结果，并标记为最近使用"""
+        entry = self._search_cache.get(query)
+        if entry is None:
+            return None
+        stored_at, results = entry
+        if time.monotonic() - stored_at > self.search_cache_ttl:
+            del self._search_cache[query]
+            return None
+        self._search_cache.move_to_end(query)
+        return results
+
+    def _put_cached_search(self, query: str, results: List[Dict]):
+        """缓存搜索结果，超出容量时淘汰最久未使用的查询"""
+        if self.search_cache_size <= 0:
+            return
+        self._search_cache[query] = (time.monotonic(), results)
+        self._search_cache.move_to_end(query)
+        while len(self._search_cache) > self.search_cache_size:
+            self._search_cache.popitem(last=False)
+
     def extract_brand_from_url(self, url: str) -> Optional[str]:
         """从URL提取品牌信息"""
-        brand_patterns = {
-            'carrier': 'Carrier',
-            'trane': 'Trane',
-            'bosch': 'BOSCH',
-            'lennox': 'Lennox',
-            'goodman': 'Goodman',
-            'daikin': 'Daikin'
-        }
-
-        url_lower = url.lower()
-        for pattern, brand in brand_patterns.items():
-            if pattern in url_lower:
-                return brand
-        return None
+        return _match_brand(url.lower())
 
     def extract_brand_from_query(self, query: str) -> Optional[str]:
         """从查询提取品牌信息"""
-        brand_keywords = {
-            'Carrier': ['carrier', 'carrier hvac', 'carrier heating'],
-            'Trane': ['trane', 'trane hvac', 'trane heating'],
-            'BOSCH': ['bosch', 'bosch hvac', 'bosch heating'],
-            'Lennox': ['lennox', 'lennox hvac', 'lennox heating'],
-            'Goodman': ['goodman', 'goodman hvac', 'goodman heating'],
-            'Daikin': ['daikin', 'daikin hvac', 'daikin heating']
-        }
-
-        query_lower = query.lower()
-        for brand, keywords in brand_keywords.items():
-            if any(keyword in query_lower for keyword in keywords):
-                return brand
-        return None
+        return _match_brand(query.lower())
 
     async def collect_brand_data(self, brand: str) -> List[DataPoint]:
         """收集特定品牌的数据"""
@@ -244,44 +433,71 @@ class HVACDataCollector:
         """运行完整的数据收集流程"""
         logger.info("开始HVAC市场数据收集流程")
 
-        all_data = []
+        # 各来源的结果分块保存，最后一次遍历完成合并
+        chunks = []
 
         # 收集品牌数据
         for brand in self.config.get('target_brands', []):
-            brand_data = await self.collect_brand_data(brand)
-            all_data.extend(brand_data)
+            chunks.append(await self.collect_brand_data(brand))
 
         # 收集政策法规数据
-        policy_data = await self.collect_policy_data()
-        all_data.extend(policy_data)
+        chunks.append(await self.collect_policy_data())
 
         # 收集召回数据
-        recall_data = await self.collect_recall_data()
-        all_data.extend(recall_data)
+        chunks.append(await self.collect_recall_data())
 
         # 收集区域数据
         geo_scope = self.config.get('geographic_scope', 'national')
         if geo_scope != 'national':
-            regional_data = await self.collect_regional_data(geo_scope)
-            all_data.extend(regional_data)
+            chunks.append(await self.collect_regional_data(geo_scope))
 
         # 数据去重和验证
-        all_data = self.deduplicate_data(all_data)
-        all_data = self.validate_data(all_data)
+        all_data = self.finalize_data(chunks)
 
         self.collected_data = all_data
         logger.info(f"数据收集完成，共收集 {len(all_data)} 个数据点")
 
         return all_data
 
+    def finalize_data(self, chunks: List[List[DataPoint]]) -> List[DataPoint]:
+        """单次遍历完成去重和验证，结果与先 deduplicate_data 再 validate_data 相同"""
+        items = list(chain.from_iterable(chunks))
+
+        # 数据量大时在子进程中预先计算哈希和敏感词检测；去重和标记仍在主进程按顺序进行
+        fingerprints = None
+        workers = os.cpu_count() or 1
+        if workers > 1 and len(items) >= PARALLEL_FINALIZE_THRESHOLD:
+            fingerprints = _fingerprint_items_parallel(
+                [(item.url, item.content) for item in items], workers)
+
+        seen = set()
+        unique = 0
+        valid_data = []
+
+        for index, item in enumerate(items):
+            if fingerprints is None:
+                key, sensitive = _dedup_key(item.url, item.content), None
+            else:
+                key, sensitive = fingerprints[index]
+            if key in seen:
+                continue
+            seen.add(key)
+            unique += 1
+            if self._validate_item(item, sensitive):
+                valid_data.append(item)
+
+        logger.info(f"去重完成，原始数据 {len(items)} -> 去重后 {unique}")
+        logger.info(f"数据验证完成，有效数据 {len(valid_data)}")
+        return valid_data
+
     def deduplicate_data(self, data: List[DataPoint]) -> List[DataPoint]:
         """数据去重"""
         seen = set()
         unique_data = []
 
         for item in data:
-            # 使用URL和内容前100字符作为去重键
-            key = (item.url, item.content[:100])
+            # 使用URL和内容前100字符的哈希作为去重键
+            key = _dedup_key(item.url, item.content)
             if key not in seen:
                 seen.add(key)
                 unique_data.append(item)
@@ -294,28 +510,43 @@ class HVACDataCollector:
         valid_data = []
 
         for item in data:
-            # 基本验证
-            if not item.url or not item.content:
-                logger.warning(f"跳过无效数据: 缺少URL或内容")
-                continue
-
-            # 敏感信息检测
-            sensitive_keywords = ['unreleased', 'confidential', 'internal', '未发布', '机密']
-            if any(keyword in item.content.lower() for keyword in sensitive_keywords):
-                item.sensitivity = 'restricted'
-                logger.info(f"检测到敏感信息: {item.source}")
-
-            valid_data.append(item)
+            if self._validate_item(item):
+                valid_data.append(item)
 
         logger.info(f"数据验证完成，有效数据 {len(valid_data)}")
         return valid_data
 
-    def save_collected_data(self, filepath: str = "collected_data.json"):
-        """保存收集的数据"""
-        data_dict = [asdict(item) for item in self.collected_data]
+    def _validate_item(self, item: DataPoint, sensitive: Optional[bool] = None) -> bool:
+        """验证单个数据点并标记敏感度，无效时返回False；sensitive 为预先算好的敏感词检测结果"""
+        # 基本验证
+        if not item.url or not item.content:
+            logger.warning(f"跳过无效数据: 缺少URL或内容")
+            return False
+
+        if sensitive is None:
+            # 小写内容只计算一次，后续检测复用
+            content_lower = item.content.lower()
+            sensitive = _contains_sensitive(content_lower)
+
+        # 敏感信息检测
+        if sensitive:
+            item.sensitivity = 'restricted'
+            logger.info(f"检测到敏感信息: {item.source}")
 
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data_dict, f, indent=2, ensure_ascii=False)
+        return True
+
+    def save_collected_data(self, filepath: str = "collected_data.json"):
+        """保存收集的数据（逐条流式写入，不构建完整的字典列表）"""
+        with open(filepath, 'wb') as f:
+            if not self.collected_data:
+                f.write(b'[]')
+            else:
+                f.write(b'[\n  ')
+                for index, item in enumerate(self.collected_data):
+                    if index:
+                        f.write(b',\n  ')
+                    f.write(_dump_item(item.to_dict()))
+                f.write(b'\n]')
 
         logger.info(f"数据已保存到: {filepath}")
 
@@ -324,38 +555,41 @@ class HVACDataCollector:
         if not self.collected_data:
             return {}
 
-        summary = {
-            'total_data_points': len(self.collected_data),
-            'by_brand': {},
-            'by_data_type': {},
-            'by_sensitivity': {},
-            'bosch_data_points': 0,
-            'time_range': {
-                'earliest': None,
-                'latest': None
-            }
-        }
+        by_brand = Counter()
+        by_data_type = Counter()
+        by_sensitivity = Counter()
+        bosch_data_points = 0
+        earliest = latest = None
 
+        # 单次遍历，计数与时间范围都累积在局部变量中
         for item in self.collected_data:
-            # 按品牌统计
-            if item.brand:
-                summary['by_brand'][item.brand] = summary['by_brand'].get(item.brand, 0) + 1
+            brand = item.brand
+            if brand:
+                by_brand[brand] += 1
+            by_data_type[item.data_type] += 1
+            by_sensitivity[item.sensitivity] += 1
 
-            # 按数据类型统计
-            summary['by_data_type'][item.data_type] = summary['by_data_type'].get(item.data_type, 0) + 1
+            # BOSCH数据点统计
+            if brand == 'BOSCH' or (item.metadata and item.metadata.get('bosch_priority')):
+                bosch_data_points += 1
 
-            # 按敏感度统计
-            summary['by_sensitivity'][item.sensitivity] = summary['by_sensitivity'].get(item.sensitivity, 0) + 1
+            timestamp = item.timestamp
+            if not earliest or timestamp < earliest:
+                earliest = timestamp
+            if not latest or timestamp > latest:
+                latest = timestamp
 
-            # BOSCH数据点统计
-            if item.brand == 'BOSCH' or (item.metadata and item.metadata.get('bosch_priority')):
-                summary['bosch_data_points'] += 1
-
-            # 时间范围
-            if not summary['time_range']['earliest'] or item.timestamp < summary['time_range']['earliest']:
-                summary['time_range']['earliest'] = item.timestamp
-            if not summary['time_range']['latest'] or item.timestamp > summary['time_range']['latest']:
-                summary['time_range']['latest'] = item.timestamp
+        summary = {
+            'total_data_points': len(self.collected_data),
+            'by_brand': dict(by_brand),
+            'by_data_type': dict(by_data_type),
+            'by_sensitivity': dict(by_sensitivity),
+            'bosch_data_points': bosch_data_points,
+            'time_range': {
+                'earliest': earliest,
+                'latest': latest
+            }
+        }
 
         return summary
 
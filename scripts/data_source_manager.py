@@ -4,30 +4,73 @@ HVAC首席商业分析师 - 数据源管理器
 管理数据源配置、验证和动态增减
 """
 
+import asyncio
+import copy
+import os
 import yaml
 import json
-import requests
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+from backpressure import AdaptiveConcurrency
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 优先使用libyaml的C实现加载/导出配置，不可用时退回纯Python实现
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+@lru_cache(maxsize=16)
+def _parse_yaml_config(path: str, mtime_ns: int, size: int) -> Dict:
+    """解析YAML配置文件；以 (路径, 修改时间, 大小) 为键缓存，文件未变时不重复解析"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+# HTTP连接池上限与单次请求超时（秒）
+HTTP_CONNECTION_LIMIT = 200
+HTTP_TIMEOUT = 10
+
+# 批量验证数据源时的初始并发数
+VALIDATE_CONCURRENCY = 64
+
+def create_http_session() -> 'aiohttp.ClientSession':
+    """创建带连接池和keep-alive的aiohttp会话，需在事件循环中调用并由调用方关闭"""
+    connector = aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT, keepalive_timeout=30)
+    return aiohttp.ClientSession(connector=connector,
+                                 timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT))
+
 class DataSourceManager:
     def __init__(self, config_path: str = "references/data_source_config.yaml"):
         self.config_path = config_path
+        self._dirty = False
+        self._batch_depth = 0
         self.config = self.load_config()
         self.brand_urls = self._init_brand_urls()
+        self._rebuild_indexes()
 
     def load_config(self) -> Dict:
         """加载数据源配置"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-                logger.info(f"已加载数据源配置: {self.config_path}")
-                return config
+            stat = os.stat(self.config_path)
+            config = _parse_yaml_config(self.config_path, stat.st_mtime_ns, stat.st_size)
+            logger.info(f"已加载数据源配置: {self.config_path}")
+            # 管理器会原地修改配置，因此返回副本，缓存始终对应磁盘上的内容
+            return copy.deepcopy(config)
         except FileNotFoundError:
             logger.warning(f"配置文件不存在，创建默认配置: {self.config_path}")
             return self.create_default_config()
@@ -248,13 +291,77 @@ class DataSourceManager:
 
     def save_config(self, config: Optional[Dict] = None):
         """保存配置到文件"""
-        if config is None:
+        saving_current = config is None
+        if saving_current:
             config = self.config
 
         with open(self.config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, default_flow_style=False, allow_unicode=True, indent=2)
+            yaml.dump(config, f, Dumper=_YAML_DUMPER, default_flow_style=False,
+                      allow_unicode=True, indent=2)
+        if saving_current:
+            self._dirty = False
         logger.info(f"配置已保存到: {self.config_path}")
 
+    def flush(self):
+        """将未保存的修改写入配置文件"""
+        if self._dirty:
+            self.save_config()
+
+    @contextmanager
+    def batch(self):
+        """批量修改：块内的修改只在退出时写一次文件
+
+        with manager.batch():
+            for name in names:
+                manager.update_last_checked(name)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def _rebuild_indexes(self):
+        """单次遍历数据源，重建名称/启用/BOSCH/分类/品牌索引"""
+        sources = self.config['data_sources']
+        # 名称重复时以第一个为准，与按顺序查找的结果一致
+        self._by_name: Dict[str, Dict] = {}
+        self._enabled_sources: List[Dict] = []
+        self._bosch_sources: List[Dict] = []
+        self._category_index: Dict[str, List[Dict]] = {}
+        # 品牌类数据源对任意品牌都返回，故每个品牌的列表都包含它们（保持原顺序）
+        self._brand_index: Dict[str, List[Dict]] = {
+            source['brand']: [] for source in sources if source.get('brand')
+        }
+
+        for source in sources:
+            self._by_name.setdefault(source['name'], source)
+            category = source.get('category')
+            self._category_index.setdefault(category, []).append(source)
+            if source['enabled']:
+                self._enabled_sources.append(source)
+            brand = source.get('brand')
+            if brand == 'BOSCH' or source.get('special_analysis'):
+                self._bosch_sources.append(source)
+            if category == 'brand':
+                for brand_sources in self._brand_index.values():
+                    brand_sources.append(source)
+            elif brand:
+                self._brand_index[brand].append(source)
+
+        # 按优先级排序
+        self._enabled_sources.sort(key=lambda x: x.get('priority', 3))
+
+    def _mark_dirty(self, reindex: bool = True):
+        """记录配置已修改：必要时重建索引，批量模式外立即保存"""
+        self._dirty = True
+        if reindex:
+            self._rebuild_indexes()
+        if self._batch_depth == 0:
+            self.save_config()
+
     def add_data_source(self, name: str, url: str, description: str,
                        priority: int = 3, category: str = 'custom',
                        brand: Optional[str] = None):
@@ -272,72 +379,137 @@ class DataSourceManager:
         }
 
         # 检查是否已存在
-        for source in self.config['data_sources']:
-            if source['name'] == name:
-                logger.warning(f"数据源 {name} 已存在，跳过添加")
-                return False
+        if name in self._by_name:
+            logger.warning(f"数据源 {name} 已存在，跳过添加")
+            return False
 
         self.config['data_sources'].append(new_source)
-        self.save_config()
+        self._mark_dirty()
         logger.info(f"已添加新数据源: {name}")
         return True
 
     def remove_data_source(self, name: str):
         """删除数据源"""
-        original_length = len(self.config['data_sources'])
+        if name not in self._by_name:
+            logger.warning(f"未找到数据源: {name}")
+            return False
+
         self.config['data_sources'] = [
             source for source in self.config['data_sources']
             if source['name'] != name
         ]
-
-        if len(self.config['data_sources']) < original_length:
-            self.save_config()
-            logger.info(f"已删除数据源: {name}")
-            return True
-        else:
-            logger.warning(f"未找到数据源: {name}")
-            return False
+        self._mark_dirty()
+        logger.info(f"已删除数据源: {name}")
+        return True
 
     def toggle_data_source(self, name: str, enabled: bool):
         """启用/禁用数据源"""
-        for source in self.config['data_sources']:
-            if source['name'] == name:
-                source['enabled'] = enabled
-                self.save_config()
-                status = "启用" if enabled else "禁用"
-                logger.info(f"已{status}数据源: {name}")
-                return True
+        source = self._by_name.get(name)
+        if source is None:
+            logger.warning(f"未找到数据源: {name}")
+            return False
 
-        logger.warning(f"未找到数据源: {name}")
-        return False
+        source['enabled'] = enabled
+        self._mark_dirty()
+        status = "启用" if enabled else "禁用"
+        logger.info(f"已{status}数据源: {name}")
+        return True
 
     def get_enabled_sources(self) -> List[Dict]:
-        """获取启用的数据源列表"""
-        enabled_sources = [source for source in self.config['data_sources'] if source['enabled']]
-        # 按优先级排序
-        enabled_sources.sort(key=lambda x: x.get('priority', 3))
-        return enabled_sources
+        """获取启用的数据源列表（按优先级排序）"""
+        return list(self._enabled_sources)
 
     def get_brand_sources(self, brand: str) -> List[Dict]:
         """获取特定品牌的数据源"""
-        brand_sources = []
-        for source in self.config['data_sources']:
-            if source.get('brand') == brand or source['category'] == 'brand':
-                brand_sources.append(source)
-        return brand_sources
+        if brand in self._brand_index:
+            return list(self._brand_index[brand])
+        return list(self._category_index.get('brand', []))
 
     def get_bosch_sources(self) -> List[Dict]:
         """获取BOSCH专用数据源（优先级最高）"""
-        bosch_sources = []
-        for source in self.config['data_sources']:
-            if source.get('brand') == 'BOSCH' or source.get('special_analysis'):
-                bosch_sources.append(source)
-        return bosch_sources
+        return list(self._bosch_sources)
 
     def validate_source(self, url: str) -> Tuple[bool, str]:
-        """验证数据源可访问性"""
+        """验证数据源可访问性（同步接口，协程中请使用 validate_source_async）"""
+        if aiohttp is not None:
+            return asyncio.run(self.validate_source_async(url))
+        return self._validate_source_blocking(url)
+
+    async def validate_source_async(self, url: str,
+                                    session: Optional['aiohttp.ClientSession'] = None) -> Tuple[bool, str]:
+        """异步验证数据源可访问性，可传入共享会话以复用连接"""
+        if aiohttp is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._validate_source_blocking, url)
+
+        if session is None:
+            async with create_http_session() as own_session:
+                return await self.validate_source_async(url, own_session)
+
+        return await self._head(session, url)
+
+    async def _head(self, session: 'aiohttp.ClientSession', url: str,
+                    slot=None) -> Tuple[bool, str]:
+        """发送HEAD请求；传入并发名额时把状态码和限流响应头反馈给AIMD控制器"""
+        try:
+            async with session.head(url, allow_redirects=False) as response:
+                if slot is not None:
+                    slot.observe(response.status, response.headers)
+                if response.status == 200:
+                    return True, "可访问"
+                else:
+                    return False, f"HTTP {response.status}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if slot is not None and isinstance(e, asyncio.TimeoutError):
+                slot.mark_overloaded()
+            return False, f"连接错误: {str(e) or type(e).__name__}"
+
+    def validate_all_sources(self, names: Optional[List[str]] = None) -> Dict[str, Tuple[bool, str]]:
+        """批量验证数据源可访问性（同步接口，协程中请使用 validate_all_sources_async）"""
+        return asyncio.run(self.validate_all_sources_async(names))
+
+    async def validate_all_sources_async(self, names: Optional[List[str]] = None,
+                                         session: Optional['aiohttp.ClientSession'] = None
+                                         ) -> Dict[str, Tuple[bool, str]]:
+        """并发验证多个数据源（默认全部），返回 名称 -> (是否可访问, 说明)
+
+        所有请求共用一个会话，并发数由AIMD控制器调节；完成后批量更新检查时间，只写一次配置文件。
+        """
+        if names is None:
+            sources = list(self._by_name.values())
+        else:
+            sources = [self._by_name[name] for name in names if name in self._by_name]
+
+        if aiohttp is not None and session is None:
+            async with create_http_session() as own_session:
+                return await self.validate_all_sources_async(names, own_session)
+
+        limiter = AdaptiveConcurrency(initial=VALIDATE_CONCURRENCY)
+
+        async def check(source: Dict) -> Tuple[bool, str]:
+            async with limiter.slot() as slot:
+                if session is None:
+                    return await self.validate_source_async(source['url'])
+                return await self._head(session, source['url'], slot)
+
+        outcomes = await asyncio.gather(*(check(source) for source in sources),
+                                        return_exceptions=True)
+
+        results = {}
+        with self.batch():
+            for source, outcome in zip(sources, outcomes):
+                if isinstance(outcome, Exception):
+                    outcome = (False, f"验证出错: {str(outcome)}")
+                results[source['name']] = outcome
+                self.update_last_checked(source['name'])
+        return results
+
+    def _validate_source_blocking(self, url: str) -> Tuple[bool, str]:
+        """使用requests同步验证数据源（未安装aiohttp时的后备实现）"""
+        if requests is None:
+            return False, "未安装HTTP客户端库 (aiohttp 或 requests)"
         try:
-            response = requests.head(url, timeout=10)
+            response = requests.head(url, timeout=HTTP_TIMEOUT)
             if response.status_code == 200:
                 return True, "可访问"
             else:
@@ -347,28 +519,27 @@ class DataSourceManager:
 
     def update_last_checked(self, name: str):
         """更新数据源最后检查时间"""
-        for source in self.config['data_sources']:
-            if source['name'] == name:
-                source['last_checked'] = datetime.now().isoformat()
-                self.save_config()
-                return True
-        return False
+        source = self._by_name.get(name)
+        if source is None:
+            return False
+
+        source['last_checked'] = datetime.now().isoformat()
+        # 检查时间不影响任何索引
+        self._mark_dirty(reindex=False)
+        return True
 
     def get_config_summary(self) -> Dict:
         """获取配置摘要"""
-        total_sources = len(self.config['data_sources'])
-        enabled_sources = len(self.get_enabled_sources())
-        brand_sources = len([s for s in self.config['data_sources'] if s['category'] == 'brand'])
-        bosch_sources = len(self.get_bosch_sources())
+        category_index = self._category_index
 
         return {
-            'total_sources': total_sources,
-            'enabled_sources': enabled_sources,
-            'brand_sources': brand_sources,
-            'bosch_priority_sources': bosch_sources,
-            'government_sources': len([s for s in self.config['data_sources'] if s['category'] == 'government']),
-            'industry_sources': len([s for s in self.config['data_sources'] if s['category'] == 'industry']),
-            'policy_sources': len([s for s in self.config['data_sources'] if s['category'] == 'policy'])
+            'total_sources': len(self.config['data_sources']),
+            'enabled_sources': len(self._enabled_sources),
+            'brand_sources': len(category_index.get('brand', [])),
+            'bosch_priority_sources': len(self._bosch_sources),
+            'government_sources': len(category_index.get('government', [])),
+            'industry_sources': len(category_index.get('industry', [])),
+            'policy_sources': len(category_index.get('policy', []))
         }
 
 def main():
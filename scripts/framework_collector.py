@@ -5,12 +5,41 @@ HVAC首席商业分析师 - 框架收集器
 """
 
 import json
-import yaml
+import sys
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _make_reader() -> Callable[[str], str]:
+    """返回读取一行回答的函数
+
+    交互终端直接使用 input()；标准输入为管道或文件时，首次调用一次性读入全部内容，之后按行返回，
+    不再逐行走 input() 的慢路径。回答用完时与 input() 一样抛出 EOFError。
+    """
+    if sys.stdin is None or sys.stdin.isatty():
+        return input
+
+    lines = None
+
+    def read_line(prompt: str = "") -> str:
+        nonlocal lines
+        if lines is None:
+            lines = iter(sys.stdin.read().splitlines())
+        print(prompt, end="", flush=True)
+        try:
+            return next(lines)
+        except StopIteration:
+            raise EOFError from None
+
+    return read_line
 
 class HVACFrameworkCollector:
     def __init__(self):
+        self._readline = _make_reader()
         self.config = {
             "analysis_goal": None,
             "target_brands": [],
@@ -46,7 +75,7 @@ class HVACFrameworkCollector:
             print(f"{key}. {value}")
 
         while True:
-            choice = input("\n请输入选择: ").strip()
+            choice = self._readline("\n请输入选择: ").strip()
             if choice in goals:
                 self.config["analysis_goal"] = goals[choice]
                 return goals[choice]
@@ -73,7 +102,7 @@ class HVACFrameworkCollector:
         print("\n注意：BOSCH会自动进行深度分析，无需额外标记")
 
         while True:
-            choices = input("\n请选择品牌: ").strip()
+            choices = self._readline("\n请选择品牌: ").strip()
             try:
                 selected = []
                 for choice in choices.split(","):
@@ -110,7 +139,7 @@ class HVACFrameworkCollector:
             print(f"{key}. {value}")
 
         while True:
-            choice = input("\n请输入选择: ").strip()
+            choice = self._readline("\n请输入选择: ").strip()
             if choice == "1":
                 start_date = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
             elif choice == "2":
@@ -119,7 +148,7 @@ class HVACFrameworkCollector:
                 start_date = (datetime.now() - timedelta(days=1095)).strftime("%Y-%m-%d")
             elif choice == "4":
                 print("\n请输入自定义开始时间 (YYYY-MM-DD):")
-                start_date = input("开始时间: ").strip()
+                start_date = self._readline("开始时间: ").strip()
                 try:
                     datetime.strptime(start_date, "%Y-%m-%d")
                 except ValueError:
@@ -151,12 +180,12 @@ class HVACFrameworkCollector:
             print(f"{key}. {value}")
 
         while True:
-            choice = input("\n请输入选择: ").strip()
+            choice = self._readline("\n请输入选择: ").strip()
             if choice in options:
                 scope = options[choice]
                 if choice == "5":
                     print("\n请输入具体州/区域（用逗号分隔）:")
-                    custom_scope = input("州/区域: ").strip()
+                    custom_scope = self._readline("州/区域: ").strip()
                     scope += f" ({custom_scope})"
                 self.config["geographic_scope"] = scope
                 return scope
@@ -184,21 +213,25 @@ class HVACFrameworkCollector:
             print(f"{key}. {value}")
 
         print("\n直接回车表示使用全部数据源，或输入要排除的数据源编号：")
-        exclusion = input("排除的数据源编号（可选）: ").strip()
+        exclusion = self._readline("排除的数据源编号（可选）: ").strip()
 
         if not exclusion:
             selected_sources = list(sources.values())
         else:
-            exclude_list = [s.strip() for s in exclusion.split(",")]
-            selected_sources = [v for k, v in sources.items() if k not in exclude_list]
+            exclude_set = {s.strip() for s in exclusion.split(",")}
+            selected_sources = [v for k, v in sources.items() if k not in exclude_set]
 
         self.config["data_sources"] = selected_sources
         return selected_sources
 
     def save_config(self, filepath: str = "analysis_config.json"):
         """保存配置到文件"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(self.config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(self.config, f, indent=2, ensure_ascii=False)
         print(f"\n✅ 配置已保存到: {filepath}")
 
     def generate_summary(self):
@@ -229,7 +262,7 @@ class HVACFrameworkCollector:
 
         self.generate_summary()
 
-        confirm = input("\n配置是否正确？输入 'yes' 确认，其他键重新开始: ").strip().lower()
+        confirm = self._readline("\n配置是否正确？输入 'yes' 确认，其他键重新开始: ").strip().lower()
         if confirm != 'yes':
             print("\n重新开始配置...")
             return self.run_collection()
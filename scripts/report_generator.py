@@ -5,49 +5,40 @@ HVAC首席商业分析师 - 报告生成器
 """
 
 import json
-import yaml
+from collections import Counter
 from datetime import datetime
+from itertools import islice
 from typing import Dict, List, Optional, Any
 import os
+import re
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
-class HVACReportGenerator:
-    def __init__(self, config_path: str = "analysis_config.json",
-                 data_path: str = "collected_data.json",
-                 bosch_analysis_path: str = "bosch_deep_analysis.json"):
-        self.config = self.load_json(config_path)
-        self.data = self.load_json(data_path) or []
-        self.bosch_analysis = self.load_json(bosch_analysis_path)
-        self.template = self.load_template()
+# Markdown行内粗体
+_BOLD = re.compile(r'\*\*(.+?)\*\*')
 
-    def load_json(self, filepath: str) -> Optional[Dict]:
-        """加载JSON文件"""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logger.warning(f"文件未找到: {filepath}")
-            return None
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON解析错误 {filepath}: {e}")
-            return None
+# 模板中的章节占位标题 -> 生成该章节内容的方法名
+REPORT_SECTIONS = {
+    '执行摘要': 'generate_executive_summary',
+    '品牌深度分析': 'generate_brand_analysis',
+    '政策法规影响': 'generate_policy_analysis',
+    '市场趋势': 'generate_market_trends',
+    '产品召回': 'generate_recall_analysis',
+    '区域市场': 'generate_regional_opportunities',
+    '结论与建议': 'generate_conclusions',
+    '附录': 'generate_appendix'
+}
 
-    def load_template(self) -> Dict:
-        """加载报告模板"""
-        try:
-            with open('references/report_template.md', 'r', encoding='utf-8') as f:
-                return {'markdown_template': f.read()}
-        except FileNotFoundError:
-            logger.warning("报告模板未找到，使用默认模板")
-            return {
-                'markdown_template': self.get_default_template()
-            }
+_SECTION_PLACEHOLDER_RE = re.compile('|'.join(re.escape(f"## {title}") for title in REPORT_SECTIONS))
 
-    def get_default_template(self) -> str:
-        """获取默认报告模板"""
-        return """# HVAC市场分析报告
+# 默认Markdown报告模板（references/report_template.md 不存在时使用）
+DEFAULT_MARKDOWN_TEMPLATE = """# HVAC市场分析报告
 
 ## 执行摘要
 
@@ -102,19 +93,250 @@ class HVACReportGenerator:
 {APPENDIX_CONTENT}
 """
 
+# HTML报告外壳；CSS中的花括号按原样书写，导入时在内容位置切分为前后两段
+_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>HVAC市场分析报告</title>
+    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            background-color: white;
+            padding: 40px;
+            border-radius: 8px;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #2c3e50;
+            border-bottom: 3px solid #3498db;
+            padding-bottom: 10px;
+        }
+        h2 {
+            color: #34495e;
+            margin-top: 30px;
+            border-bottom: 2px solid #ecf0f1;
+            padding-bottom: 5px;
+        }
+        h3 {
+            color: #2980b9;
+            margin-top: 20px;
+        }
+        table {
+            border-collapse: collapse;
+            width: 100%;
+            margin: 20px 0;
+        }
+        th, td {
+            border: 1px solid #ddd;
+            padding: 12px;
+            text-align: left;
+        }
+        th {
+            background-color: #3498db;
+            color: white;
+        }
+        tr:nth-child(even) {
+            background-color: #f2f2f2;
+        }
+        .highlight {
+            background-color: #fff3cd;
+            padding: 15px;
+            border-left: 4px solid #ffc107;
+            margin: 20px 0;
+        }
+        .toc {
+            background-color: #ecf0f1;
+            padding: 20px;
+            border-radius: 5px;
+            margin: 20px 0;
+        }
+        .toc ul {
+            list-style-type: none;
+        }
+        .toc a {
+            text-decoration: none;
+            color: #2980b9;
+        }
+        .toc a:hover {
+            text-decoration: underline;
+        }
+        .metadata {
+            font-size: 0.9em;
+            color: #7f8c8d;
+            margin: 20px 0;
+        }
+        @media print {
+            body {
+                background-color: white;
+            }
+            .container {
+                box-shadow: none;
+            }
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        {html_content}
+    </div>
+</body>
+</html>
+"""
+_HTML_PREFIX, _HTML_SUFFIX = _HTML_TEMPLATE.split('{html_content}')
+
+# 延迟加载属性的“尚未加载”标记
+_UNLOADED = object()
+
+def _inline(text: str) -> str:
+    """转换行内格式（粗体）；不含粗体标记的文本直接返回，跳过正则替换"""
+    if '**' not in text:
+        return text
+    return _BOLD.sub(r'<strong>\1</strong>', text)
+
+class HVACReportGenerator:
+    def __init__(self, config_path: str = "analysis_config.json",
+                 data_path: str = "collected_data.json",
+                 bosch_analysis_path: str = "bosch_deep_analysis.json"):
+        self.config = self.load_json(config_path)
+        time_range = (self.config or {}).get('time_range') or {}
+        self._time_range_str = f"{time_range.get('start', '')} 至 {time_range.get('end', '')}"
+        # 数据、BOSCH分析和模板在首次访问时才加载
+        self._data_path = data_path
+        self._bosch_analysis_path = bosch_analysis_path
+        self._data = _UNLOADED
+        self._bosch_analysis = _UNLOADED
+        self._template = _UNLOADED
+        self._partitions_ready = False
+
+    @property
+    def data(self) -> List[Dict]:
+        """收集的数据点（首次访问时加载）"""
+        if self._data is _UNLOADED:
+            self._data = self.load_json(self._data_path) or []
+        return self._data
+
+    @data.setter
+    def data(self, value: List[Dict]):
+        self._data = value
+        self._partitions_ready = False
+
+    @property
+    def bosch_analysis(self) -> Optional[Dict]:
+        """BOSCH深度分析结果（首次访问时加载）"""
+        if self._bosch_analysis is _UNLOADED:
+            self._bosch_analysis = self.load_json(self._bosch_analysis_path)
+        return self._bosch_analysis
+
+    @bosch_analysis.setter
+    def bosch_analysis(self, value: Optional[Dict]):
+        self._bosch_analysis = value
+
+    @property
+    def template(self) -> Dict:
+        """报告模板（首次访问时加载）"""
+        if self._template is _UNLOADED:
+            self._template = self.load_template()
+        return self._template
+
+    @template.setter
+    def template(self, value: Dict):
+        self._template = value
+
+    def _ensure_partitions(self):
+        """首次需要时构建数据分组"""
+        if not self._partitions_ready:
+            self._build_partitions()
+
+    def _build_partitions(self):
+        """单次遍历数据，按品牌、品牌+数据类型分组并统计品牌和来源数量，供各章节复用"""
+        self._brand_counts = Counter()
+        self._source_counts = Counter()
+        self._by_brand: Dict[Any, List[Dict]] = {}
+        self._by_brand_type: Dict[tuple, List[Dict]] = {}
+        # 政策/趋势/召回章节的筛选结果；每个数据点的小写字段只计算一次
+        self._policy_items: List[Dict] = []
+        self._regional_items: List[Dict] = []
+        self._tech_items: List[Dict] = []
+        self._product_items: List[Dict] = []
+        self._recall_items: List[Dict] = []
+
+        for item in self.data:
+            brand = item.get('brand')
+            data_type = item.get('data_type')
+            data_type_lc = item.get('data_type', '').lower()
+            content = item.get('content', '')
+            content_lc = content.lower()
+
+            if 'policy' in data_type_lc or 'government' in item.get('source', '').lower():
+                self._policy_items.append(item)
+            if 'region' in item.get('metadata', {}).get('geographic_scope', '').lower():
+                self._regional_items.append(item)
+            if data_type == 'technical' or 'technology' in content_lc:
+                self._tech_items.append(item)
+            if data_type == 'product' or 'product' in data_type_lc:
+                self._product_items.append(item)
+            if 'recall' in content_lc or '召回' in content:
+                self._recall_items.append(item)
+
+            self._brand_counts[item.get('brand', 'Unknown')] += 1
+            self._source_counts[item.get('source', 'Unknown')] += 1
+            self._by_brand.setdefault(brand, []).append(item)
+            self._by_brand_type.setdefault((brand, data_type), []).append(item)
+
+        self._partitions_ready = True
+
+    def load_json(self, filepath: str) -> Optional[Dict]:
+        """加载JSON文件（优先使用orjson直接解析字节）"""
+        try:
+            if orjson is not None:
+                with open(filepath, 'rb') as f:
+                    return orjson.loads(f.read())
+            with open(filepath, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"文件未找到: {filepath}")
+            return None
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON解析错误 {filepath}: {e}")
+            return None
+
+    def load_template(self) -> Dict:
+        """加载报告模板"""
+        try:
+            with open('references/report_template.md', 'r', encoding='utf-8') as f:
+                return {'markdown_template': f.read()}
+        except FileNotFoundError:
+            logger.warning("报告模板未找到，使用默认模板")
+            return {
+                'markdown_template': self.get_default_template()
+            }
+
+    def get_default_template(self) -> str:
+        """获取默认报告模板"""
+        return DEFAULT_MARKDOWN_TEMPLATE
+
     def generate_executive_summary(self) -> str:
         """生成执行摘要"""
         brands = self.config.get('target_brands', [])
-        time_range = f"{self.config.get('time_range', {}).get('start', '')} 至 {self.config.get('time_range', {}).get('end', '')}"
+        time_range = self._time_range_str
 
         # 分析数据点统计
+        self._ensure_partitions()
         total_data_points = len(self.data)
-        brand_counts = {}
-        for item in self.data:
-            brand = item.get('brand', 'Unknown')
-            brand_counts[brand] = brand_counts.get(brand, 0) + 1
+        brand_counts = self._brand_counts
 
-        summary = f"""
+        parts = [f"""
 ## 执行摘要
 
 本报告基于 **{time_range}** 期间的数据，对 **{', '.join(brands)}** 在北美HVAC市场的表现进行了全面分析。
@@ -135,278 +357,282 @@ class HVACReportGenerator:
 3. **政策法规解读** - 分析DOE能效标准等行业政策影响
 4. **BOSCH专项深度** - 8个维度深入分析BOSCH市场地位
 5. **区域机会识别** - 挖掘州级激励政策带来的市场空间
-"""
+"""]
 
         if self.bosch_analysis:
-            summary += f"""
+            parts.append(f"""
 ### BOSCH特别关注
 
 基于深度分析，BOSCH在以下方面表现突出：
 - **产品创新**: {len(self.bosch_analysis.get('product_innovation', {}).get('new_product_launches', []))} 项新品发布
 - **技术优势**: {len(self.bosch_analysis.get('technology_advantage', {}).get('core_technologies', []))} 项核心技术
 - **市场定位**: 重点关注{self.config.get('geographic_scope', '北美')}市场扩张
-"""
+""")
 
-        return summary
+        return ''.join(parts)
 
     def generate_brand_analysis(self) -> str:
         """生成品牌分析章节"""
-        analysis = "\n## 2. 品牌深度分析\n\n"
+        parts = ["\n## 2. 品牌深度分析\n\n"]
 
+        self._ensure_partitions()
         brands = self.config.get('target_brands', [])
 
-        for brand in brands:
-            analysis += f"### 2.{brands.index(brand) + 1} {brand}品牌分析\n\n"
+        for number, brand in enumerate(brands, 1):
+            parts.append(f"### 2.{number} {brand}品牌分析\n\n")
 
             # 收集该品牌的数据
-            brand_data = [item for item in self.data if item.get('brand') == brand]
+            brand_data = self._by_brand.get(brand, [])
 
             if not brand_data:
-                analysis += f"暂无{brand}品牌相关数据。\n\n"
+                parts.append(f"暂无{brand}品牌相关数据。\n\n")
                 continue
 
             # 按数据类型分组
-            products = [item for item in brand_data if item.get('data_type') == 'product']
-            news = [item for item in brand_data if item.get('data_type') == 'news']
-            technical = [item for item in brand_data if item.get('data_type') == 'technical']
+            products = self._by_brand_type.get((brand, 'product'), [])
+            news = self._by_brand_type.get((brand, 'news'), [])
+            technical = self._by_brand_type.get((brand, 'technical'), [])
 
-            analysis += f"**数据概况**: 收集到 {len(brand_data)} 个相关数据点\n\n"
+            parts.append(f"**数据概况**: 收集到 {len(brand_data)} 个相关数据点\n\n")
 
             if products:
-                analysis += f"#### 产品动态\n\n"
+                parts.append(f"#### 产品动态\n\n")
                 for product in products[:3]:  # 只显示前3个
-                    analysis += f"- **{product.get('source', '')}**: {product.get('content', '')[:200]}...\n"
-                analysis += "\n"
+                    parts.append(f"- **{product.get('source', '')}**: {product.get('content', '')[:200]}...\n")
+                parts.append("\n")
 
             if technical:
-                analysis += f"#### 技术创新\n\n"
+                parts.append(f"#### 技术创新\n\n")
                 for tech in technical[:3]:
-                    analysis += f"- **{tech.get('source', '')}**: {tech.get('content', '')[:200]}...\n"
-                analysis += "\n"
+                    parts.append(f"- **{tech.get('source', '')}**: {tech.get('content', '')[:200]}...\n")
+                parts.append("\n")
 
             if news:
-                analysis += f"#### 市场动态\n\n"
+                parts.append(f"#### 市场动态\n\n")
                 for news_item in news[:3]:
-                    analysis += f"- **{news_item.get('source', '')}**: {news_item.get('content', '')[:200]}...\n"
-                analysis += "\n"
+                    parts.append(f"- **{news_item.get('source', '')}**: {news_item.get('content', '')[:200]}...\n")
+                parts.append("\n")
 
         # 添加BOSCH深度分析
         if 'BOSCH' in brands and self.bosch_analysis:
             bosch_index = brands.index('BOSCH') + 1
-            analysis += f"""
+            parts.append(f"""
 ### 2.{bosch_index} BOSCH深度分析 ⭐
 
 **注意**: 以下为BOSCH专项深度分析，基于8个维度的全面评估。
 
-"""
+""")
 
-            analysis += self.format_bosch_deep_analysis()
+            parts.append(self.format_bosch_deep_analysis())
 
-        return analysis
+        return ''.join(parts)
 
     def format_bosch_deep_analysis(self) -> str:
         """格式化BOSCH深度分析内容"""
-        content = ""
+        parts = []
 
         # 产品创新
         product_inno = self.bosch_analysis.get('product_innovation', {})
         if product_inno.get('new_product_launches'):
-            content += f"#### 产品创新亮点\n\n"
+            parts.append(f"#### 产品创新亮点\n\n")
             for item in product_inno['new_product_launches']:
-                content += f"- **{item.get('timestamp', '')}**: {item.get('content', '')}\n"
-            content += "\n"
+                parts.append(f"- **{item.get('timestamp', '')}**: {item.get('content', '')}\n")
+            parts.append("\n")
 
         # 市场定位
         market_pos = self.bosch_analysis.get('market_positioning', {})
         if market_pos.get('target_segments'):
-            content += f"#### 目标市场细分\n\n"
+            parts.append(f"#### 目标市场细分\n\n")
             for item in market_pos['target_segments']:
-                content += f"- {item.get('segment', '')}\n"
-            content += "\n"
+                parts.append(f"- {item.get('segment', '')}\n")
+            parts.append("\n")
 
         # 渠道策略
         channel = self.bosch_analysis.get('channel_strategy', {})
         if channel.get('strategic_partnerships'):
-            content += f"#### 战略合作伙伴\n\n"
+            parts.append(f"#### 战略合作伙伴\n\n")
             for item in channel['strategic_partnerships']:
-                content += f"- {item.get('partner', '')}\n"
-            content += "\n"
+                parts.append(f"- {item.get('partner', '')}\n")
+            parts.append("\n")
 
         # 财务表现
         financial = self.bosch_analysis.get('financial_performance', {})
         if financial.get('revenue_data'):
-            content += f"#### 财务数据\n\n"
+            parts.append(f"#### 财务数据\n\n")
             for item in financial['revenue_data']:
-                content += f"- **{item.get('timestamp', '')}**: {item.get('data', '')}\n"
-            content += "\n"
+                parts.append(f"- **{item.get('timestamp', '')}**: {item.get('data', '')}\n")
+            parts.append("\n")
 
         # 技术优势
         tech_adv = self.bosch_analysis.get('technology_advantage', {})
         if tech_adv.get('core_technologies'):
-            content += f"#### 核心技术优势\n\n"
+            parts.append(f"#### 核心技术优势\n\n")
             for item in tech_adv['core_technologies']:
-                content += f"- {item.get('technology', '')}\n"
-            content += "\n"
+                parts.append(f"- {item.get('technology', '')}\n")
+            parts.append("\n")
 
         # 竞争护城河
         moat = self.bosch_analysis.get('competitive_moat', {})
         if moat.get('brand_strength'):
-            content += f"#### 品牌优势\n\n"
+            parts.append(f"#### 品牌优势\n\n")
             for item in moat['brand_strength']:
-                content += f"- {item.get('strength', '')}\n"
-            content += "\n"
+                parts.append(f"- {item.get('strength', '')}\n")
+            parts.append("\n")
 
         # 战略举措
         strategic = self.bosch_analysis.get('strategic_initiatives', {})
         if strategic.get('market_expansion'):
-            content += f"#### 市场扩张战略\n\n"
+            parts.append(f"#### 市场扩张战略\n\n")
             for item in strategic['market_expansion']:
-                content += f"- **{item.get('timestamp', '')}**: {item.get('initiative', '')}\n"
-            content += "\n"
+                parts.append(f"- **{item.get('timestamp', '')}**: {item.get('initiative', '')}\n")
+            parts.append("\n")
 
         # 风险因素
         risks = self.bosch_analysis.get('risk_factors', {})
         if risks.get('market_risks'):
-            content += f"#### 风险因素分析\n\n"
+            parts.append(f"#### 风险因素分析\n\n")
             for item in risks['market_risks']:
-                content += f"- ⚠️ {item.get('risk', '')}\n"
-            content += "\n"
+                parts.append(f"- ⚠️ {item.get('risk', '')}\n")
+            parts.append("\n")
 
-        return content
+        return ''.join(parts)
 
     def generate_policy_analysis(self) -> str:
         """生成政策法规分析章节"""
-        content = """
+        self._ensure_partitions()
+        parts = ["""
 ## 3. 政策法规影响分析
 
 ### 3.1 DOE能效标准
 
 根据美国能源部（DOE）的最新能效标准，HVAC行业正在经历重大变革：
 
-"""
+"""]
 
-        # 收集政策相关数据
-        policy_data = [item for item in self.data if 'policy' in item.get('data_type', '').lower() or 'government' in item.get('source', '').lower()]
+        # 收集政策相关数据（只取前5条）
+        policy_data = self._policy_items[:5]
 
         if policy_data:
-            for item in policy_data[:5]:
-                content += f"- **{item.get('source', '')}**: {item.get('content', '')[:200]}...\n"
+            for item in policy_data:
+                parts.append(f"- **{item.get('source', '')}**: {item.get('content', '')[:200]}...\n")
         else:
-            content += "- 暂无具体政策数据，建议查阅DOE官网获取最新信息\n"
+            parts.append("- 暂无具体政策数据，建议查阅DOE官网获取最新信息\n")
 
-        content += """
+        parts.append("""
 ### 3.2 州级激励政策
 
 各州针对空调产品的激励政策对市场产生重要影响：
 
-"""
+""")
 
         # 收集区域政策数据
-        regional_data = [item for item in self.data if 'region' in item.get('metadata', {}).get('geographic_scope', '').lower()]
+        regional_data = self._regional_items[:5]
 
         if regional_data:
-            for item in regional_data[:5]:
-                content += f"- **{item.get('source', '')}**: {item.get('content', '')[:200]}...\n"
+            for item in regional_data:
+                parts.append(f"- **{item.get('source', '')}**: {item.get('content', '')[:200]}...\n")
         else:
-            content += "- 暂无区域政策数据，建议查阅DSIRE数据库\n"
+            parts.append("- 暂无区域政策数据，建议查阅DSIRE数据库\n")
 
-        return content
+        return ''.join(parts)
 
     def generate_market_trends(self) -> str:
         """生成市场趋势分析"""
-        content = """
+        self._ensure_partitions()
+        parts = ["""
 ## 4. 市场趋势分析
 
 ### 4.1 技术创新趋势
 
-"""
+"""]
 
         # 收集技术数据
-        tech_data = [item for item in self.data if item.get('data_type') == 'technical' or 'technology' in item.get('content', '').lower()]
+        tech_data = self._tech_items[:5]
 
         if tech_data:
-            for item in tech_data[:5]:
-                content += f"- **{item.get('source', '')}**: {item.get('content', '')[:200]}...\n"
+            for item in tech_data:
+                parts.append(f"- **{item.get('source', '')}**: {item.get('content', '')[:200]}...\n")
         else:
-            content += "- 暂无技术趋势数据\n"
+            parts.append("- 暂无技术趋势数据\n")
 
-        content += """
+        parts.append("""
 ### 4.2 产品发布动态
 
-"""
+""")
 
         # 收集产品数据
-        product_data = [item for item in self.data if item.get('data_type') == 'product' or 'product' in item.get('data_type', '').lower()]
+        product_data = self._product_items[:5]
 
         if product_data:
-            for item in product_data[:5]:
-                content += f"- **{item.get('brand', '')}** - {item.get('content', '')[:200]}...\n"
+            for item in product_data:
+                parts.append(f"- **{item.get('brand', '')}** - {item.get('content', '')[:200]}...\n")
         else:
-            content += "- 暂无产品发布数据\n"
+            parts.append("- 暂无产品发布数据\n")
 
-        return content
+        return ''.join(parts)
 
     def generate_recall_analysis(self) -> str:
         """生成召回分析"""
-        content = """
+        self._ensure_partitions()
+        parts = ["""
 ## 5. 产品召回分析
 
 产品召回对品牌形象和市场信心有重要影响。以下是收集到的召回信息：
 
-"""
+"""]
 
         # 收集召回数据
-        recall_data = [item for item in self.data if 'recall' in item.get('content', '').lower() or '召回' in item.get('content', '')]
+        recall_data = self._recall_items
 
         if recall_data:
-            for item in recall_data:
+            for number, item in enumerate(recall_data, 1):
                 brand = item.get('brand', 'Unknown')
-                content += f"""
-### 5.{recall_data.index(item) + 1} {brand}产品召回
+                parts.append(f"""
+### 5.{number} {brand}产品召回
 
 - **信息来源**: {item.get('source', '')}
 - **召回详情**: {item.get('content', '')}
 - **影响范围**: {item.get('metadata', {}).get('impact', '未知')}
-"""
+""")
         else:
-            content += """
+            parts.append("""
 ✅ **好消息**: 在分析期间内，未发现重大HVAC产品召回事件。
 
 这表明行业整体质量控制水平较高，各品牌对产品质量把控严格。
-"""
+""")
 
-        return content
+        return ''.join(parts)
 
     def generate_regional_opportunities(self) -> str:
         """生成区域市场机会分析"""
         geo_scope = self.config.get('geographic_scope', 'national')
 
-        content = f"""
+        parts = [f"""
 ## 6. 区域市场机会分析
 
 ### 6.1 {geo_scope}市场概况
 
-"""
+"""]
 
         # 根据地理范围生成内容
         if 'east' in geo_scope.lower():
-            content += """
+            parts.append("""
 东部各州（特别是纽约、马萨诸塞等）一直是能效政策的先行者，这些州通常有更严格的要求和更大的激励力度。
-"""
+""")
         elif 'south' in geo_scope.lower():
-            content += """
+            parts.append("""
 南部各州（德州、佛州等）是HVAC产品的重要市场，气候条件使得空调需求旺盛。
-"""
+""")
         elif 'west' in geo_scope.lower():
-            content += """
+            parts.append("""
 西部各州（加州、华盛顿等）在环保和能效方面要求严格，是高端产品的重点市场。
-"""
+""")
         else:
-            content += """
+            parts.append("""
 全国范围内，各州政策差异较大，需要针对性分析。
-"""
+""")
 
-        content += """
+        parts.append("""
 ### 6.2 政策激励带来的机会
 
 - **直接激励**: 直接补贴和税收减免
@@ -418,9 +644,9 @@ class HVACReportGenerator:
 - 重点关注政策友好的州/区域
 - 优先投资符合高能效标准的产品线
 - 建立本地化的渠道和售后网络
-"""
+""")
 
-        return content
+        return ''.join(parts)
 
     def generate_conclusions(self) -> str:
         """生成结论与建议"""
@@ -458,7 +684,8 @@ class HVACReportGenerator:
 
     def generate_appendix(self) -> str:
         """生成附录 - 数据源"""
-        content = """
+        self._ensure_partitions()
+        parts = ["""
 ## 附录：数据源与信息来源
 
 ### 数据收集概况
@@ -473,26 +700,15 @@ class HVACReportGenerator:
 #### 政府和行业机构
 """.format(
             total_points=len(self.data),
-            source_count=len(set(item.get('source', '') for item in self.data)),
-            time_range=f"{self.config.get('time_range', {}).get('start', '')} 至 {self.config.get('time_range', {}).get('end', '')}"
-        )
+            source_count=len(self._source_counts),
+            time_range=self._time_range_str
+        )]
 
-        # 按来源分组显示数据源
-        sources = {}
-        for item in self.data:
-            source = item.get('source', 'Unknown')
-            if source not in sources:
-                sources[source] = []
-            sources[source].append({
-                'url': item.get('url', ''),
-                'type': item.get('data_type', ''),
-                'timestamp': item.get('timestamp', '')
-            })
-
-        for source, items in list(sources.items())[:10]:  # 只显示前10个
-            content += f"- **{source}**: {len(items)} 个数据点\n"
-
-        content += """
+        # 按来源显示数据点数量（分组计数在 _build_partitions 中单次遍历完成）
+        for source, count in islice(self._source_counts.items(), 10):  # 只显示前10个
+            parts.append(f"- **{source}**: {count} 个数据点\n")
+
+        parts.append("""
 ### 敏感信息声明
 
 本报告中标记为"restricted"或"confidential"的信息来源于行业内部知情人士，
@@ -507,164 +723,69 @@ class HVACReportGenerator:
 
 本报告基于公开信息和行业分析，仅供参考。
 投资决策请结合多方面信息，谨慎评估风险。
-""".format(current_date=datetime.now().strftime('%Y-%m-%d'))
+""".format(current_date=datetime.now().strftime('%Y-%m-%d')))
 
-        return content
+        return ''.join(parts)
 
     def generate_markdown_report(self, output_path: str = "hvac_market_analysis.md") -> str:
         """生成Markdown格式报告"""
+        self._write_markdown_report(output_path)
+        return output_path
+
+    def _write_markdown_report(self, output_path: str) -> str:
+        """生成并写入Markdown报告，返回报告内容（供HTML转换直接使用）"""
         logger.info("生成Markdown格式报告...")
 
-        # 构建报告内容
+        # 填充模板
         report_content = self.template['markdown_template'].format(
-            time_range=f"{self.config.get('time_range', {}).get('start', '')} 至 {self.config.get('time_range', {}).get('end', '')}",
+            time_range=self._time_range_str,
             brands=', '.join(self.config.get('target_brands', [])),
             key_findings='详见各章节分析',
             BOSCH_CONTENT=self.format_bosch_deep_analysis() if self.bosch_analysis else '未启用BOSCH深度分析',
             APPENDIX_CONTENT=self.generate_appendix()
         )
 
-        # 替换各章节内容
-        sections = {
-            '执行摘要': self.generate_executive_summary(),
-            '品牌深度分析': self.generate_brand_analysis(),
-            '政策法规影响': self.generate_policy_analysis(),
-            '市场趋势': self.generate_market_trends(),
-            '产品召回': self.generate_recall_analysis(),
-            '区域市场': self.generate_regional_opportunities(),
-            '结论与建议': self.generate_conclusions(),
-            '附录': self.generate_appendix()
-        }
-
-        # 动态替换章节
-        for section_title, section_content in sections.items():
-            placeholder = f"## {section_title}"
-            if placeholder in report_content:
-                report_content = report_content.replace(placeholder, f"{placeholder}\n{section_content}")
-
-        # 保存Markdown文件
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(report_content)
+        # 单次扫描模板中的章节占位标题，在每个标题后插入章节内容，按顺序直接写入文件；
+        # 只生成模板中实际出现的章节
+        sections = {}
+        parts = []
+        with open(output_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            position = 0
+            for match in _SECTION_PLACEHOLDER_RE.finditer(report_content):
+                placeholder = match.group(0)
+                if placeholder not in sections:
+                    sections[placeholder] = getattr(self, REPORT_SECTIONS[placeholder[3:]])()
+                chunk = (report_content[position:match.end()], '\n', sections[placeholder])
+                f.writelines(chunk)
+                parts.extend(chunk)
+                position = match.end()
+            tail = report_content[position:]
+            f.write(tail)
+            parts.append(tail)
 
         logger.info(f"Markdown报告已保存到: {output_path}")
-        return output_path
+        return ''.join(parts)
 
     def generate_html_report(self, markdown_path: str = "hvac_market_analysis.md",
-                           output_path: str = "hvac_market_analysis.html") -> str:
-        """生成HTML格式报告"""
+                           output_path: str = "hvac_market_analysis.html",
+                           markdown_content: Optional[str] = None) -> str:
+        """生成HTML格式报告；传入 markdown_content 时直接转换，不再读取 markdown_path"""
         logger.info("生成HTML格式报告...")
 
         # 读取Markdown内容
-        try:
-            with open(markdown_path, 'r', encoding='utf-8') as f:
-                markdown_content = f.read()
-        except FileNotFoundError:
-            logger.error(f"Markdown文件未找到: {markdown_path}")
-            return ""
+        if markdown_content is None:
+            try:
+                with open(markdown_path, 'r', encoding='utf-8') as f:
+                    markdown_content = f.read()
+            except FileNotFoundError:
+                logger.error(f"Markdown文件未找到: {markdown_path}")
+                return ""
 
         # 简单的Markdown到HTML转换（实际使用中可以调用markdown库）
         html_content = self.convert_markdown_to_html(markdown_content)
 
         # 添加HTML头部和样式
-        full_html = f"""
-<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>HVAC市场分析报告</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .container {{
-            background-color: white;
-            padding: 40px;
-            border-radius: 8px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        h1 {{
-            color: #2c3e50;
-            border-bottom: 3px solid #3498db;
-            padding-bottom: 10px;
-        }}
-        h2 {{
-            color: #34495e;
-            margin-top: 30px;
-            border-bottom: 2px solid #ecf0f1;
-            padding-bottom: 5px;
-        }}
-        h3 {{
-            color: #2980b9;
-            margin-top: 20px;
-        }}
-        table {{
-            border-collapse: collapse;
-            width: 100%;
-            margin: 20px 0;
-        }}
-        th, td {{
-            border: 1px solid #ddd;
-            padding: 12px;
-            text-align: left;
-        }}
-        th {{
-            background-color: #3498db;
-            color: white;
-        }}
-        tr:nth-child(even) {{
-            background-color: #f2f2f2;
-        }}
-        .highlight {{
-            background-color: #fff3cd;
-            padding: 15px;
-            border-left: 4px solid #ffc107;
-            margin: 20px 0;
-        }}
-        .toc {{
-            background-color: #ecf0f1;
-            padding: 20px;
-            border-radius: 5px;
-            margin: 20px 0;
-        }}
-        .toc ul {{
-            list-style-type: none;
-        }}
-        .toc a {{
-            text-decoration: none;
-            color: #2980b9;
-        }}
-        .toc a:hover {{
-            text-decoration: underline;
-        }}
-        .metadata {{
-            font-size: 0.9em;
-            color: #7f8c8d;
-            margin: 20px 0;
-        }}
-        @media print {{
-            body {{
-                background-color: white;
-            }}
-            .container {{
-                box-shadow: none;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        {html_content}
-    </div>
-</body>
-</html>
-"""
+        full_html = ''.join((_HTML_PREFIX, html_content, _HTML_SUFFIX))
 
         # 保存HTML文件
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -674,41 +795,62 @@ class HVACReportGenerator:
         return output_path
 
     def convert_markdown_to_html(self, markdown: str) -> str:
-        """简单的Markdown到HTML转换"""
-        import re
+        """简单的Markdown到HTML转换：逐行单次扫描，支持标题、无序列表、段落和粗体"""
+        parts = []
+        paragraph = []
+        in_list = False
+
+        def flush_paragraph():
+            if paragraph:
+                text = '\n'.join(paragraph)
+                parts.append(f"<p>{_inline(text)}</p>")
+                paragraph.clear()
+
+        for line in markdown.splitlines():
+            if not line.strip():
+                flush_paragraph()
+                if in_list:
+                    parts.append('</ul>')
+                    in_list = False
+                continue
 
-        # 转换标题
-        html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', markdown, flags=re.MULTILINE)
-        html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-        html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
+            if line.startswith('- '):
+                flush_paragraph()
+                if not in_list:
+                    parts.append('<ul>')
+                    in_list = True
+                parts.append(f"<li>{_inline(line[2:])}</li>")
+                continue
 
-        # 转换粗体
-        html = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', html)
+            if in_list:
+                parts.append('</ul>')
+                in_list = False
 
-        # 转换列表
-        html = re.sub(r'^- (.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-        html = re.sub(r'(<li>.*</li>)', r'<ul>\1</ul>', html, flags=re.DOTALL)
+            if line.startswith('#'):
+                level = len(line) - len(line.lstrip('#'))
+                if level <= 6 and line[level:level + 1] == ' ':
+                    flush_paragraph()
+                    parts.append(f"<h{level}>{_inline(line[level + 1:].strip())}</h{level}>")
+                    continue
 
-        # 转换段落
-        html = re.sub(r'\n\n', '</p><p>', html)
-        html = '<p>' + html + '</p>'
+            paragraph.append(line)
 
-        # 清理空标签
-        html = re.sub(r'<p>\s*</p>', '', html)
-        html = re.sub(r'<p>\s*<h', r'<h', html)
-        html = re.sub(r'</h>\s*</p>', r'</h>', html)
+        flush_paragraph()
+        if in_list:
+            parts.append('</ul>')
 
-        return html
+        return '\n'.join(parts)
 
     def generate_complete_report(self) -> Dict[str, str]:
         """生成完整报告（Markdown + HTML）"""
         logger.info("开始生成完整报告...")
 
         # 生成Markdown报告
-        md_path = self.generate_markdown_report()
+        md_path = "hvac_market_analysis.md"
+        markdown_content = self._write_markdown_report(md_path)
 
-        # 生成HTML报告
-        html_path = self.generate_html_report(md_path)
+        # 生成HTML报告（直接使用内存中的Markdown内容，不再回读文件）
+        html_path = self.generate_html_report(md_path, markdown_content=markdown_content)
 
         return {
             'markdown': md_path,
@@ -1,5 +1,6 @@
 import os
 import subprocess
+import sys
 
 print("=" * 60)
 print("HVAC Business Analyst - Auto GitHub Push")
@@ -10,36 +11,39 @@ result = subprocess.run(["git", "status", "--porcelain"], capture_output=True, t
 status = result.stdout
 
 if not status.strip():
+    # Nothing to add, commit or push
     print("No changes to commit")
-else:
-    print("Changed files:")
-    for line in status.strip().split('\n'):
-        print(f"  {line}")
+    sys.exit(0)
 
-# Add files
-print("\nAdding files...")
-subprocess.run(["git", "add", "."])
+print("Changed files:")
+for line in status.strip().split('\n'):
+    print(f"  {line}")
 
-# Commit
+# Commit message
 import datetime
 timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
 commit_msg = f"Update: {timestamp}"
 
-print(f"Committing with message: {commit_msg}")
-result = subprocess.run(["git", "commit", "-m", commit_msg])
+# Add, commit and push through one shell call; the shell still starts each git process,
+# this only saves the per-step subprocess.run overhead on the Python side
+if os.name == "nt":
+    # Pass cmd.exe one command string: an argv list would be re-quoted by subprocess,
+    # turning the message quotes into \" which cmd.exe does not understand
+    git_chain = f'git add . && git commit -m "{commit_msg}" && git push origin main'
+    shell_cmd = f'cmd /c "{git_chain}"'
+else:
+    import shlex
+    git_chain = f"git add . && git commit -m {shlex.quote(commit_msg)} && git push origin main"
+    shell_cmd = ["sh", "-c", git_chain]
+
+print(f"\nAdding, committing and pushing with message: {commit_msg}")
+result = subprocess.run(shell_cmd, check=False)
 
 if result.returncode == 0:
-    print("Commit successful")
-    
-    # Push
-    print("Pushing to GitHub...")
-    result = subprocess.run(["git", "push", "origin", "main"])
-    
-    if result.returncode == 0:
-        print("\n" + "=" * 60)
-        print("Successfully pushed to GitHub!")
-        print("=" * 60)
-    else:
-        print("Push failed")
+    print("\n" + "=" * 60)
+    print("Successfully pushed to GitHub!")
+    print("=" * 60)
 else:
-    print("Commit failed")
+    print(f"Add/commit/push failed (exit code {result.returncode}) while running:")
+    print(f"  {git_chain}")
+    print("Check the git output above to see which step failed (add, commit or push)")